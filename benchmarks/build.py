@@ -0,0 +1,46 @@
+"""
+Measures the time it takes to build a Player and every game model.
+
+Run from the repository root:
+
+    python -m benchmarks.build [--number N]
+
+Copyright (c) 2021-present duhby
+MIT License, see LICENSE for more details.
+"""
+
+import argparse
+import json
+import timeit
+
+import hypixel
+from hypixel.models.player.player import MODES
+from hypixel.utils import _clean
+
+RESPONSE = 'tests/responses/player.json'
+
+
+def build(response: dict) -> hypixel.Player:
+    data = {'raw': response, '_data': response['player']}
+    data.update(_clean(response['player'], mode='PLAYER'))
+    player = hypixel.Player(**data)
+    for mode in MODES:
+        getattr(player, mode)
+    return player
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--number', type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(RESPONSE) as file:
+        response = json.load(file)
+
+    timer = timeit.Timer(lambda: build(response))
+    best = min(timer.repeat(repeat=5, number=args.number)) / args.number
+    print(f'{best * 1e6:,.1f} µs per Player')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Compares JSON decoders on the player and guild responses.
+
+Decoders that aren't installed are skipped. Every decoder is passed
+the response body as bytes, the same way the client does.
+
+Run from the repository root:
+
+    python -m benchmarks.decode [--number N]
+
+Copyright (c) 2021-present duhby
+MIT License, see LICENSE for more details.
+"""
+
+import argparse
+import importlib
+import timeit
+
+RESPONSES = ('player', 'guild')
+DECODERS = ('json', 'ujson', 'orjson')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--number', type=int, default=1000)
+    args = parser.parse_args()
+
+    decoders = {}
+    for name in DECODERS:
+        try:
+            decoders[name] = importlib.import_module(name).loads
+        except ImportError:
+            print(f'{name} is not installed')
+
+    for response in RESPONSES:
+        with open(f'tests/responses/{response}.json', 'rb') as file:
+            body = file.read()
+        print(f'{response}.json ({len(body):,} bytes)')
+        for name, loads in decoders.items():
+            timer = timeit.Timer(lambda: loads(body))
+            best = min(timer.repeat(repeat=5, number=args.number))
+            print(f'  {name:<8}{best / args.number * 1e6:>10,.1f} µs')
+
+
+if __name__ == '__main__':
+    main()
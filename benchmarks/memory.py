@@ -0,0 +1,78 @@
+"""
+Measures the memory used by each Player model and while building one.
+
+Run from the repository root:
+
+    python -m benchmarks.memory [--count N] [--no-modes]
+
+Baseline on CPython 3.11, with the default count, in bytes per Player
+with every game model accessed (and with --no-modes):
+
+    Before models used __slots__     76,596 (494)
+    After models used __slots__      72,140 (542)
+
+_clean modified its input back then, so those builds copied the player
+data first. The copy isn't kept, so it only adds to the peak.
+
+Copyright (c) 2021-present duhby
+MIT License, see LICENSE for more details.
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+import hypixel
+from hypixel.models.player.player import MODES
+from hypixel.utils import _clean
+
+RESPONSE = 'tests/responses/player.json'
+
+
+def build(response: dict, modes: bool) -> hypixel.Player:
+    data = {'raw': response, '_data': response['player']}
+    data.update(_clean(response['player'], mode='PLAYER'))
+    player = hypixel.Player(**data)
+    if modes:
+        for mode in MODES:
+            getattr(player, mode)
+    return player
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument(
+        '--no-modes',
+        action='store_true',
+        help="don't access the game models",
+    )
+    args = parser.parse_args()
+
+    with open(RESPONSE) as file:
+        response = json.load(file)
+    # The raw response is shared, so only the models are measured.
+    build(response, not args.no_modes)
+
+    gc.collect()
+    tracemalloc.start()
+    players = [build(response, not args.no_modes) for _ in range(args.count)]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{size / len(players):,.0f} bytes per Player')
+    del players
+
+    gc.collect()
+    tracemalloc.start()
+    build(response, not args.no_modes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{peak:,} bytes peak while building a Player')
+
+
+if __name__ == '__main__':
+    main()
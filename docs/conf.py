@@ -58,6 +58,7 @@ rst_prolog = """
 .. |hypixel| replace:: This method requests data from Hypixel.
 .. |mojang| replace:: This method requests data from Mojang.
 .. |data| replace:: This method requires the ``hypixel.py-data`` package.
+.. |numpy| replace:: This function requires the ``numpy`` package.
 """
 
 # Add any paths that contain templates here, relative to this directory.
@@ -15,9 +15,12 @@ __copyright__ = 'Copyright 2021-present duhby'
 __version__ = '0.4.2'
 
 from .achievement import *
+from .cache import *
 from .client import *
 from .color import *
 from .errors import *
+from .export import *
 from .models import *
 from .game import *
+from .levels import *
 from .utils import *
@@ -5,7 +5,6 @@ MIT License, see LICENSE for more details.
 
 from __future__ import annotations
 from dataclasses import dataclass
-import functools
 from typing import Optional
 
 from . import utils
@@ -20,11 +19,30 @@ __all__ = [
     'Achievement',
 ]
 
+# (category, lowercase name) -> achievement data, built on first use.
+_INDEX = None
+# Type name -> achievement, for achievements that exist.
+_ACHIEVEMENTS = {}
 
-@dataclass
+def _get_index() -> dict:
+    global _INDEX
+    if _INDEX is None:
+        # Some achievement names are not all uppercase.
+        _INDEX = {
+            (category, name.lower()): data
+            for category, achievements in ACHIEVEMENTS.items()
+            for name, data in achievements.get('one_time', {}).items()
+        }
+    return _INDEX
+
+
+@dataclass(frozen=True)
 class Achievement:
     """Represents a Hypixel achievement.
 
+    Achievements are immutable and shared, so there is one instance per
+    type name.
+
     Attributes
     ----------
     type_name: :class:`str`
@@ -63,9 +81,8 @@ class Achievement:
     legacy: bool = False
 
     @classmethod
-    @functools.lru_cache()
     def from_type(cls, type_name: str) -> Optional[Achievement]:
-        """Constructs an :class:`Achievement` from its type name.
+        """Returns the :class:`Achievement` of a type name.
 
         |data|
 
@@ -83,22 +100,20 @@ class Achievement:
         Returns
         -------
         Optional[:class:`Achievement`]
-            The constructed achievement, or ``None`` if the achievement
-            could not be found.
+            The achievement, or ``None`` if the achievement could not be
+            found.
         """
-        if not hypixel_data:
-            return None
-        category = type_name.split('_')[0]
+        achievement = _ACHIEVEMENTS.get(type_name)
+        if achievement is not None or not hypixel_data:
+            return achievement
+        category, _, name = type_name.partition('_')
         if category == 'bridge':
             category = 'duels'
-        name = type_name.split('_')[1:]
-        # Some achievement names are not all uppercase.
-        name = '_'.join(name).lower()
-        data = ACHIEVEMENTS.get(category, {}).get('one_time', {})
-        # Some achievements are not all uppercase.
-        data = {k.lower(): v for k, v in data.items()}
-        data = data.get(name)
+        data = _get_index().get((category, name.lower()))
         if not data:
             return None
+        data = utils._clean(data, 'ACHIEVEMENT')
         data['type_name'] = type_name
-        return cls(**utils._clean(data, 'ACHIEVEMENT'))
+        achievement = cls(**data)
+        _ACHIEVEMENTS[type_name] = achievement
+        return achievement
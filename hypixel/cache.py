@@ -0,0 +1,725 @@
+"""
+Copyright (c) 2021-present duhby
+MIT License, see LICENSE for more details.
+"""
+
+import asyncio
+from collections import namedtuple
+from collections import OrderedDict
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+import zlib
+
+__all__ = [
+    'CacheBackend',
+    'CacheInfo',
+    'DiskCache',
+    'IdentityStore',
+    'MemoryCache',
+    'SQLiteCache',
+]
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+CacheInfo.__doc__ = """Cache statistics returned by
+:meth:`CacheBackend.stats`.
+
+Has the same fields as ``functools.lru_cache.cache_info()``: ``hits``,
+``misses``, ``maxsize``, and ``currsize``. All of which are an
+:class:`int` except ``maxsize`` which can also be ``None``.
+"""
+
+
+class CacheBackend:
+    """Base class for cache backends used by :class:`Client`.
+
+    Subclass this and implement every method to use your own storage,
+    e.g. a networked cache shared by multiple programs, then pass an
+    instance with the ``cache_backend`` option.
+
+    Keys are strings, and values are JSON serializable objects (API
+    responses and strings). ``None`` is never cached.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Returns the value stored for a key.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The key of the entry.
+
+        Returns
+        -------
+        Optional[Any]
+            The stored value, or ``None`` if the key is not stored or
+            the entry expired.
+        """
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """Stores a value.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The key of the entry.
+        value: Any
+            The value to store.
+        ttl: Optional[:class:`float`]
+            The amount of time (in seconds) the entry is valid for.
+            ``None`` or a value less than or equal to ``0`` means the
+            entry doesn't expire.
+        """
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        """Removes an entry if it exists.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The key of the entry.
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Removes every entry.
+
+        .. note::
+
+            This is synchronous because :meth:`Client.clear_cache` is.
+            Backends that need to do IO can schedule it instead.
+        """
+        raise NotImplementedError
+
+    def stats(self) -> CacheInfo:
+        """Returns the cache statistics.
+
+        Returns
+        -------
+        :class:`CacheInfo`
+            The hits, misses, maximum size and current size.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Releases resources held by the backend.
+
+        Does nothing by default.
+        """
+
+
+class MemoryCache(CacheBackend):
+    """An in-memory least recently used cache backend where every entry
+    expires individually.
+
+    This is the default backend.
+
+    Expired entries are removed whenever the cache is read from or
+    written to, when :meth:`stats` is called, and every
+    ``sweep_interval`` seconds if it is passed, so they never count
+    towards the size of the cache.
+
+    .. note::
+
+        Values are stored and returned as is, not copied.
+
+    Parameters
+    ----------
+    max_size: Optional[:class:`int`]
+        The amount of entries that are stored before the least recently
+        used ones are removed. ``None`` means there is no limit.
+    sweep_interval: Optional[:class:`float`]
+        The amount of time (in seconds) between removing expired entries
+        in a background task. The task starts on the first stored entry
+        and stops on :meth:`close`. ``None`` means expired entries are
+        only removed lazily.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        self.max_size = max_size
+        self.sweep_interval = sweep_interval
+        # Key -> (expiry time or None, value), least recently used first.
+        self._data = OrderedDict()
+        # Heap of (expiry time, key). Entries that were replaced or
+        # removed since are skipped when popped.
+        self._expiries = []
+        self._sweeper = None
+        self._hits = 0
+        self._misses = 0
+
+    async def get(self, key):
+        self.purge()
+        entry = self._data.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires, value = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            self._misses += 1
+            return None
+        self._data.move_to_end(key)
+        self._hits += 1
+        return value
+
+    async def set(self, key, value, ttl):
+        expires = None
+        if ttl is not None and ttl > 0:
+            expires = time.monotonic() + ttl
+            heapq.heappush(self._expiries, (expires, key))
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        if self.max_size is not None:
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+        self.purge()
+        # Replaced and evicted entries leave stale items in the heap
+        # that only expire much later, so it's rebuilt from the live
+        # entries once it's twice their size.
+        if len(self._expiries) > 2 * len(self._data):
+            self._expiries = [
+                (expires, key)
+                for key, (expires, _) in self._data.items()
+                if expires is not None
+            ]
+            heapq.heapify(self._expiries)
+        if self.sweep_interval is not None and self._sweeper is None:
+            self._sweeper = asyncio.ensure_future(self._sweep())
+
+    async def delete(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+        self._expiries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self):
+        self.purge()
+        return CacheInfo(self._hits, self._misses, self.max_size, len(self._data))
+
+    def purge(self) -> int:
+        """Removes every expired entry.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of entries removed.
+        """
+        removed = 0
+        now = time.monotonic()
+        while self._expiries and self._expiries[0][0] <= now:
+            expires, key = heapq.heappop(self._expiries)
+            entry = self._data.get(key)
+            if entry is not None and entry[0] == expires:
+                del self._data[key]
+                removed += 1
+        return removed
+
+    def close(self):
+        """Stops the background sweeper if it's running. Entries are
+        kept."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.purge()
+
+
+class SQLiteCache(CacheBackend):
+    """A cache backend stored in an SQLite database file.
+
+    Entries are stored as JSON and persist between restarts, so the
+    cache can be shared by programs that run one after the other or at
+    the same time on the same machine. Queries run in the event loop's
+    default executor so they don't block the loop.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the database file. ``':memory:'`` creates a
+        temporary in-memory database.
+    max_size: Optional[:class:`int`]
+        The amount of entries that are stored before the least recently
+        used ones are removed. ``None`` means there is no limit.
+    """
+
+    def __init__(self, path: str, max_size: Optional[int] = None):
+        self.path = path
+        self.max_size = max_size
+        self._hits = 0
+        self._misses = 0
+        # Queries run in executor threads; the lock serializes them.
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,  # Autocommit
+        )
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, '
+            'value TEXT NOT NULL, '
+            'expires REAL, '
+            'accessed REAL NOT NULL)'
+        )
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, function, *args)
+
+    def _get(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value, expires FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            value, expires = row
+            now = time.time()
+            if expires is not None and expires <= now:
+                self._connection.execute(
+                    'DELETE FROM cache WHERE key = ?', (key,)
+                )
+                self._misses += 1
+                return None
+            self._connection.execute(
+                'UPDATE cache SET accessed = ? WHERE key = ?', (now, key)
+            )
+            self._hits += 1
+        return json.loads(value)
+
+    def _set(self, key, value, ttl):
+        now = time.time()
+        expires = None
+        if ttl is not None and ttl > 0:
+            expires = now + ttl
+        value = json.dumps(value)
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)',
+                (key, value, expires, now),
+            )
+            if self.max_size is not None:
+                self._connection.execute(
+                    'DELETE FROM cache WHERE key IN ('
+                    'SELECT key FROM cache ORDER BY accessed DESC '
+                    'LIMIT -1 OFFSET ?)',
+                    (self.max_size,),
+                )
+
+    def _delete(self, key):
+        with self._lock:
+            self._connection.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    async def get(self, key):
+        return await self._run(self._get, key)
+
+    async def set(self, key, value, ttl):
+        await self._run(self._set, key, value, ttl)
+
+    async def delete(self, key):
+        await self._run(self._delete, key)
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute('DELETE FROM cache')
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self):
+        with self._lock:
+            (size,) = self._connection.execute(
+                'SELECT COUNT(*) FROM cache WHERE expires IS NULL OR expires > ?',
+                (time.time(),),
+            ).fetchone()
+        return CacheInfo(self._hits, self._misses, self.max_size, size)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class DiskCache(CacheBackend):
+    """A cache backend that stores every entry in its own compressed file
+    in a directory.
+
+    Entries persist between restarts, so a client using this backend
+    starts with the responses of the previous run instead of an empty
+    cache. Each entry keeps the time it was fetched at, so restored
+    entries expire when they would have without the restart, or sooner
+    if ``max_age`` is lowered between runs. Writes replace files
+    atomically, so the directory can be shared by multiple processes.
+
+    Files are compressed with zlib, and large files are read through a
+    memory map, so loading big player responses doesn't keep the
+    compressed data in memory as well.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the directory. It's created if it doesn't exist.
+    max_size: Optional[:class:`int`]
+        The amount of entries that are stored before the least recently
+        used ones are removed. ``None`` means there is no limit.
+    compress_level: :class:`int`
+        The zlib compression level from ``0`` to ``9``.
+        Defaults to ``6``.
+    mmap_size: :class:`int`
+        The size (in bytes) from which files are read through a memory
+        map.
+        Defaults to ``65536``.
+    max_age: Optional[:class:`float`]
+        The amount of time (in seconds) after an entry's fetch time that
+        it expires, even if it was stored with a longer TTL. Pass the
+        longest time the client caches for (e.g. ``cache_time_h``, or
+        ``stale_cache_time_h`` if it's set), so lowering it also
+        applies to entries written by earlier runs. ``None`` means
+        entries keep the TTL they were written with. A client sets it
+        to its own cache time if it's ``None``.
+        Defaults to ``None``.
+    """
+
+    # Fetch time and expiry time (0 if it doesn't expire) in front of
+    # the compressed value.
+    _header = struct.Struct('<dd')
+    _suffix = '.z'
+
+    def __init__(
+        self,
+        path: str,
+        max_size: Optional[int] = None,
+        compress_level: int = 6,
+        mmap_size: int = 65536,
+        max_age: Optional[float] = None,
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.compress_level = compress_level
+        self.mmap_size = mmap_size
+        self._max_age = max_age
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        # File name -> expiry time or None, least recently used first.
+        self._index = OrderedDict()
+        os.makedirs(path, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        # Only headers are read, so this is fast for large caches.
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.path):
+            if not name.endswith(self._suffix):
+                continue
+            file_path = os.path.join(self.path, name)
+            try:
+                with open(file_path, 'rb') as file:
+                    header = file.read(self._header.size)
+                fetched, expires = self._header.unpack(header)
+            except (OSError, struct.error):
+                continue
+            expires = self._expiry(fetched, expires)
+            if expires is not None and expires <= now:
+                self._remove(name)
+                continue
+            entries.append((fetched, name, expires))
+        for _, name, expires in sorted(entries):
+            self._index[name] = expires
+
+    @property
+    def max_age(self) -> Optional[float]:
+        """Optional[:class:`float`]: The amount of time (in seconds)
+        after an entry's fetch time that it expires. Setting it applies
+        to the entries that are already stored.
+        """
+        return self._max_age
+
+    @max_age.setter
+    def max_age(self, value: Optional[float]) -> None:
+        with self._lock:
+            self._max_age = value
+            self._index.clear()
+            self._load_index()
+
+    def _expiry(self, fetched, expires):
+        # The stored expiry (0 if it doesn't expire), capped at max_age
+        # after the fetch time.
+        expires = expires or None
+        if self._max_age is not None:
+            limit = fetched + self._max_age
+            if expires is None or limit < expires:
+                expires = limit
+        return expires
+
+    def _filename(self, key):
+        # Hashed since keys can be long and contain any character.
+        return hashlib.sha256(key.encode()).hexdigest() + self._suffix
+
+    def _remove(self, name):
+        self._index.pop(name, None)
+        try:
+            os.remove(os.path.join(self.path, name))
+        except FileNotFoundError:
+            pass
+
+    def _read(self, file):
+        # Returns the header and the decompressed value.
+        size = os.fstat(file.fileno()).st_size
+        if size < self.mmap_size:
+            data = file.read()
+            header = self._header.unpack_from(data)
+            return header, zlib.decompress(data[self._header.size:])
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            view = memoryview(data)
+            try:
+                header = self._header.unpack_from(view)
+                return header, zlib.decompress(view[self._header.size:])
+            finally:
+                view.release()
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, function, *args)
+
+    def _get(self, key):
+        name = self._filename(key)
+        with self._lock:
+            try:
+                with open(os.path.join(self.path, name), 'rb') as file:
+                    (fetched, expires), body = self._read(file)
+            except (FileNotFoundError, ValueError, struct.error, zlib.error):
+                self._index.pop(name, None)
+                self._misses += 1
+                return None
+            expires = self._expiry(fetched, expires)
+            if expires is not None and expires <= time.time():
+                self._remove(name)
+                self._misses += 1
+                return None
+            # Files written by other processes join the index here.
+            self._index[name] = expires
+            self._index.move_to_end(name)
+            self._hits += 1
+        return json.loads(body)
+
+    def _set(self, key, value, ttl):
+        name = self._filename(key)
+        now = time.time()
+        expires = now + ttl if ttl is not None and ttl > 0 else 0
+        data = self._header.pack(now, expires) + zlib.compress(
+            json.dumps(value).encode(), self.compress_level
+        )
+        # Written to a temporary file first so readers never see a
+        # partial entry.
+        fd, temp_path = tempfile.mkstemp(dir=self.path)
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, os.path.join(self.path, name))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        with self._lock:
+            self._index[name] = self._expiry(now, expires)
+            self._index.move_to_end(name)
+            if self.max_size is not None:
+                while len(self._index) > self.max_size:
+                    self._remove(next(iter(self._index)))
+
+    def _delete(self, key):
+        with self._lock:
+            self._remove(self._filename(key))
+
+    async def get(self, key):
+        return await self._run(self._get, key)
+
+    async def set(self, key, value, ttl):
+        await self._run(self._set, key, value, ttl)
+
+    async def delete(self, key):
+        await self._run(self._delete, key)
+
+    def clear(self):
+        with self._lock:
+            for name in os.listdir(self.path):
+                if name.endswith(self._suffix):
+                    self._remove(name)
+            self._index.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            size = sum(
+                1 for expires in self._index.values()
+                if expires is None or expires > now
+            )
+        return CacheInfo(self._hits, self._misses, self.max_size, size)
+
+
+class IdentityStore:
+    """A persistent store of username and uuid pairs in an SQLite
+    database file.
+
+    Pass an instance with the ``identity_store`` client option to look
+    up usernames and uuids in it before requesting them from the Mojang
+    API. The database is opened in WAL mode, so multiple processes can
+    share the same file and restarts don't repeat requests.
+
+    Usernames are matched case insensitively.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the database file. ``':memory:'`` creates a
+        temporary in-memory database.
+    max_age: Optional[:class:`float`]
+        The amount of time (in seconds) an entry is used for after it's
+        stored. ``None`` means entries don't expire. Players can change
+        their username every 30 days, so this shouldn't be much longer
+        than the default.
+        Defaults to ``86400`` (a day).
+    busy_timeout: :class:`float`
+        The amount of time (in seconds) to wait for another process to
+        finish writing.
+        Defaults to ``5``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_age: Optional[float] = 86400,
+        busy_timeout: float = 5,
+    ):
+        self.path = path
+        self.max_age = max_age
+        # Queries run in executor threads; the lock serializes them.
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path,
+            timeout=busy_timeout,
+            check_same_thread=False,
+            isolation_level=None,  # Autocommit
+        )
+        # Readers don't block the writer in other processes.
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS identities ('
+            'uuid TEXT PRIMARY KEY, '
+            'name TEXT NOT NULL, '
+            'name_lower TEXT NOT NULL, '
+            'fetched REAL NOT NULL)'
+        )
+        self._connection.execute(
+            'CREATE INDEX IF NOT EXISTS identities_name_lower '
+            'ON identities (name_lower)'
+        )
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, function, *args)
+
+    def _fetch(self, column, where, value):
+        with self._lock:
+            row = self._connection.execute(
+                f'SELECT {column}, fetched FROM identities WHERE {where} = ?',
+                (value,),
+            ).fetchone()
+        if row is None:
+            return None
+        result, fetched = row
+        if self.max_age is not None and fetched + self.max_age <= time.time():
+            return None
+        return result
+
+    def _set(self, name, uuid):
+        with self._lock:
+            # A username belongs to one player at a time.
+            self._connection.execute(
+                'DELETE FROM identities WHERE name_lower = ? AND uuid != ?',
+                (name.lower(), uuid),
+            )
+            self._connection.execute(
+                'INSERT OR REPLACE INTO identities VALUES (?, ?, ?, ?)',
+                (uuid, name, name.lower(), time.time()),
+            )
+
+    async def get_uuid(self, name: str) -> Optional[str]:
+        """Returns the stored uuid of a username.
+
+        Parameters
+        ----------
+        name: :class:`str`
+            The username, in any case.
+
+        Returns
+        -------
+        Optional[:class:`str`]
+            The uuid, or ``None`` if it isn't stored or the entry
+            expired.
+        """
+        return await self._run(
+            self._fetch, 'uuid', 'name_lower', name.lower()
+        )
+
+    async def get_name(self, uuid: str) -> Optional[str]:
+        """Returns the stored username of a uuid.
+
+        Parameters
+        ----------
+        uuid: :class:`str`
+            The uuid without dashes.
+
+        Returns
+        -------
+        Optional[:class:`str`]
+            The username, or ``None`` if it isn't stored or the entry
+            expired.
+        """
+        return await self._run(self._fetch, 'name', 'uuid', uuid)
+
+    async def set(self, name: str, uuid: str) -> None:
+        """Stores a username and uuid pair.
+
+        Parameters
+        ----------
+        name: :class:`str`
+            The username.
+        uuid: :class:`str`
+            The uuid without dashes.
+        """
+        await self._run(self._set, name, uuid)
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        with self._lock:
+            self._connection.execute('DELETE FROM identities')
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
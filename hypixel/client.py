@@ -4,18 +4,23 @@ MIT License, see LICENSE for more details.
 """
 
 import asyncio
-from collections import namedtuple
 import json
 from operator import attrgetter
+import re
 import sys
+from typing import AsyncIterator
 from typing import Dict
+from typing import Iterable
 from typing import List
+from typing import Literal
 from typing import Optional
+from typing import Tuple
 from typing import Union
 from uuid import UUID
 
 import aiohttp
 
+from .cache import *
 from .errors import *
 from .models import *
 
@@ -24,17 +29,71 @@ from .utils import ExponentialBackoff
 
 from . import utils
 
+# Every decoder here accepts bytes.
 try:
-    import ujson
+    import orjson
 
-    JSON_DECODER = ujson.loads
+    JSON_DECODER = orjson.loads
 except ImportError:
-    JSON_DECODER = json.loads
+    try:
+        import ujson
+
+        JSON_DECODER = ujson.loads
+    except ImportError:
+        JSON_DECODER = json.loads
+
+try:
+    import aiodns
+
+    HAS_AIODNS = True
+except ImportError:
+    HAS_AIODNS = False
 
 __all__ = [
     "Client",
 ]
 
+# Names that can't exist are resolved locally because one invalid name
+# fails the whole bulk request.
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9_]{1,16}$")
+
+
+def _not_found(response: dict) -> bool:
+    # Hypixel responds successfully with a null player or guild when
+    # they don't exist.
+    return any(
+        key in response and not response[key] for key in ("player", "guild")
+    )
+
+
+def _check_keep_raw(keep_raw, allow_none: bool = True) -> None:
+    # Anything but True drops the raw data, so a typo would silently
+    # lose it. None passed to a method means the client's option.
+    if keep_raw is None and allow_none:
+        return
+    if keep_raw is not True and keep_raw is not False and keep_raw != "compact":
+        raise ArgumentError(
+            f"keep_raw must be True, False or 'compact', not {keep_raw!r}."
+        )
+
+
+def _check_concurrency(concurrency) -> None:
+    # A semaphore of 0 would never let a request through.
+    if concurrency < 1:
+        raise ArgumentError("Concurrency must be at least 1.")
+
+
+def _rank_order(member: GuildMember) -> tuple:
+    # Highest rank first. The guild master's rank isn't one of the
+    # guild's ranks, so it has no priority. Legacy guilds call it
+    # "GUILDMASTER" instead of "Guild Master".
+    rank = member.rank
+    if rank.priority is not None:
+        return (1, -rank.priority)
+    if rank.name.replace(" ", "").upper() == "GUILDMASTER":
+        return (0, 0)
+    return (2, 0)
+
 
 class Client:
     """Class for interacting with both the Mojang and Hypixel APIs.
@@ -80,22 +139,21 @@ class Client:
 
         .. note::
 
-            The cache uses an async, time-invalidating, least recently
-            used implementation. This means it works on asynchronous
-            functions, can invalidate items that have been in the cache
-            for x amount of time, and can remove least recently used
-            items if the size limit is reached.
-
-        .. admonition:: Limitations
-
-            When a cached item is time-invalidated, it does not get
-            removed from the cache and can inflate the cache size with
-            multiple of the same item if they were called far enough
-            apart from each other and ``self.cache_time`` is not
-            ``None``. Also, ``self.cache_time`` is based on the time from when
-            it's first added to the cache, and not refreshed on the last
-            access to that cached item. This could also be considered a
-            feature and is therefore a design decision.
+            Responses are stored in a :class:`CacheBackend`, which is a
+            :class:`MemoryCache` unless ``self.cache_backend`` is
+            passed. Every item expires ``self.cache_time`` seconds after
+            it was stored, and the least recently used items are removed
+            if the size limit is reached.
+
+        .. note::
+
+            Only responses are cached. If a request raises an error, the
+            next call makes a new request.
+    coalesce: :class:`bool`
+        Whether or not concurrent calls to request methods with the same
+        arguments share a single request instead of each making their
+        own. This is independent of ``self.cache``.
+        Defaults to ``True``.
     cache_h: :class:`bool`
         Whether or not to cache Hypixel API calls.
         Refer to ``self.cache`` for more information.
@@ -123,12 +181,8 @@ class Client:
 
         .. note::
 
-            The timestamp of a cached item is stored when the function
-            is called, not when it is returned. So, the time the API
-            takes to get the request counts towards the time
-            invalidation. That's why it's recommended to have a value of
-            at least 10, but for the average use case it should be at
-            least 60 to get any cache hits.
+            ``None`` or a value less than or equal to ``0`` means cached
+            items don't expire.
     cache_time_h: :class:`int`
         Cache time for the Hypixel API. Refer to ``self.cache_time`` for
         more information.
@@ -137,15 +191,81 @@ class Client:
         Cache time for the Mojang API. Refer to ``self.cache_time`` for
         more information.
         Defaults to ``self.cache_time``.
+    stale_cache_time_h: :class:`float`
+        Enables stale-while-revalidate caching for the Hypixel API.
+        Responses older than ``self.cache_time_h`` are still returned
+        immediately until they are this old (in seconds), while a
+        background task refreshes them. Responses older than this are
+        requested as usual. Must be greater than ``self.cache_time_h``,
+        which must be greater than ``0``, otherwise
+        :exc:`ArgumentError` is raised. ``None`` means responses aren't
+        used after ``self.cache_time_h``.
+        Defaults to ``None``.
+    negative_cache_time: :class:`int`
+        The amount of time (in seconds) that results for players and
+        guilds that don't exist are cached. This is separate from
+        ``self.cache_time`` so that typos and nicked names don't make
+        new requests every time, while new players and guilds are still
+        found soon after they're created.
+        ``None`` means those results aren't cached.
+        Defaults to ``10``.
+    negative_cache_time_h: :class:`int`
+        Negative cache time for the Hypixel API. Refer to
+        ``self.negative_cache_time`` for more information.
+        Defaults to ``self.negative_cache_time``.
+    negative_cache_time_m: :class:`int`
+        Negative cache time for the Mojang API. Refer to
+        ``self.negative_cache_time`` for more information.
+        Defaults to ``self.negative_cache_time``.
+    cache_errors_h: Dict[Type[:exc:`HypixelException`], :class:`float`]
+        Exception types raised by Hypixel API requests that are cached,
+        and the amount of time (in seconds) they're cached for. Other
+        errors, such as a :exc:`TimeoutError` or :exc:`ApiError`, are
+        never cached, so the next call makes a new request.
+        Defaults to ``{}``.
+    cache_errors_m: Dict[Type[:exc:`HypixelException`], :class:`float`]
+        Exception types raised by Mojang API requests that are cached.
+        Refer to ``self.cache_errors_h`` for more information.
+        Defaults to ``{PlayerNotFound: self.negative_cache_time_m}``.
+    cache_sweep_time: :class:`float`
+        The amount of time (in seconds) between removing expired items
+        from the default cache backends in the background. Expired items
+        are also removed when they are accessed, so this only keeps
+        memory usage down for items that aren't requested again.
+        Defaults to ``None`` in which case there's no background task.
+    cache_backend: :class:`CacheBackend`
+        The backend cached items are stored in, e.g. a
+        :class:`SQLiteCache` to keep the cache between restarts, or a
+        subclass of :class:`CacheBackend` for your own storage.
+        ``self.cache_size`` doesn't apply to a passed backend.
+        Defaults to ``None`` in which case a :class:`MemoryCache` is
+        used.
+    cache_backend_h: :class:`CacheBackend`
+        Cache backend for the Hypixel API. Refer to
+        ``self.cache_backend`` for more information. A
+        :class:`DiskCache` makes the client start with the responses
+        of its previous run. Its ``max_age`` is set to
+        ``self.cache_time_h``, or ``self.stale_cache_time_h`` if it's
+        set, unless it was passed.
+        Defaults to ``self.cache_backend``.
+    cache_backend_m: :class:`CacheBackend`
+        Cache backend for the Mojang API. Refer to
+        ``self.cache_backend`` for more information.
+        Defaults to ``self.cache_backend``.
     rate_limit: :class:`bool`
         Whether or not to handle rate limits.
         Defaults to ``True``.
 
         .. note::
 
-            For the Hypixel API, this will wait for the 'Retry-After'
-            header's amount of time either until a non-429 status is
-            returned, or 'Retry-After' exceeds ``self.timeout``.
+            For the Hypixel API, requests are paced with a
+            :class:`RateLimiter` using the 'RateLimit-*' headers of
+            every response, so requests wait for the rate limit window
+            to reset instead of getting a 429 status. If one is still
+            returned (e.g. the key is shared with another program),
+            this will wait for the 'Retry-After' header's amount of time
+            either until a non-429 status is returned, or 'Retry-After'
+            exceeds ``self.timeout``.
 
         .. note::
 
@@ -182,6 +302,82 @@ class Client:
             Mojang API requests, if a 429 response is received and the
             interval is greater than ``self.timeout``, then it will
             raise a :exc:`TimeoutError`.
+    batch_uuids: :class:`bool`
+        Whether or not to resolve usernames to uuids in batches. If
+        ``True``, usernames that are looked up within ``self.batch_time``
+        of each other are resolved together with Mojang's bulk profile
+        endpoint, 10 usernames per request, instead of one request per
+        username. This applies to every method that accepts a username.
+        Defaults to ``False``.
+    batch_time: :class:`float`
+        The amount of time (in seconds) to collect usernames for before
+        a batch is requested.
+        Defaults to ``0.05``.
+    identity_store: :class:`~hypixel.IdentityStore`
+        A persistent store to look up usernames and uuids in before
+        requesting them from the Mojang API. Resolved usernames and
+        uuids are saved to it, so restarts and other processes sharing
+        the store don't request them again. The client doesn't close
+        it.
+        Defaults to ``None``.
+    json_decoder: Callable[[:class:`bytes`], Any]
+        The function responses are decoded with. It's passed the
+        response body as :class:`bytes`, so it isn't decoded to a
+        :class:`str` first.
+        Defaults to ``orjson.loads`` if orjson is installed, then
+        ``ujson.loads`` if ujson is installed, and otherwise
+        ``json.loads``.
+    keep_raw: Union[:class:`bool`, :class:`str`]
+        Whether or not models keep the raw response they were built
+        from in their ``raw`` attribute. ``False`` drops it, and
+        ``'compact'`` keeps it as zlib compressed JSON :class:`bytes`,
+        which can be loaded with
+        ``json.loads(zlib.decompress(model.raw))``. Either way, player
+        game models are built right away instead of when they're
+        first accessed, since they need the response. This saves a lot
+        of memory when models are kept for a long time. Methods that
+        return these models also accept a ``keep_raw`` keyword argument
+        that overrides this. Any other value raises
+        :exc:`ArgumentError`.
+        Defaults to ``True``.
+    concurrency: :class:`int`
+        The maximum amount of requests bulk methods such as
+        :meth:`players` will have in flight at once. Must be at least
+        ``1``.
+        Defaults to ``10``.
+    session: :class:`aiohttp.ClientSession`
+        An externally owned session to make requests with. The client
+        won't close it, so it can be shared with the rest of your
+        program.
+        Defaults to ``None`` in which case the client creates and closes
+        its own session using the connection options below.
+
+        .. note::
+
+            The connection options and ``self.timeout`` don't apply to
+            a passed session.
+    connection_limit: :class:`int`
+        The maximum amount of simultaneous connections.
+        ``0`` means there is no limit.
+        Defaults to ``100``.
+    connection_limit_per_host: :class:`int`
+        The maximum amount of simultaneous connections to the same host
+        (e.g. api.hypixel.net). ``0`` means there is no limit.
+        Defaults to ``0``.
+    keepalive_timeout: :class:`float`
+        The amount of time (in seconds) idle connections are kept open
+        to be reused. Reusing a connection skips the TCP and TLS
+        handshakes, so long-running programs may want to increase this.
+        Defaults to ``15``.
+    dns_cache_time: :class:`int`
+        The amount of time (in seconds) resolved DNS addresses are
+        cached. ``None`` caches them forever.
+        Defaults to ``10``.
+    async_dns: :class:`bool`
+        Whether or not to resolve DNS with ``aiodns`` (included in the
+        ``speed`` extra) instead of a thread pool.
+        Defaults to ``True`` if ``aiodns`` is installed, otherwise
+        ``False``.
 
     Raises
     ------
@@ -220,6 +416,8 @@ class Client:
         self.autoverify = options.get("autoverify", False)
         self.timeout = options.get("timeout", 10)
 
+        self.coalesce = options.get("coalesce", True)
+
         self.cache = options.get("cache", False)
         self.cache_h = options.get("cache_h", self.cache)
         self.cache_m = options.get("cache_m", self.cache)
@@ -232,39 +430,141 @@ class Client:
         self.cache_time_h = options.get("cache_time_h", self.cache_time)
         self.cache_time_m = options.get("cache_time_m", self.cache_time)
 
+        self.stale_cache_time_h = options.get("stale_cache_time_h", None)
+        if self.stale_cache_time_h is not None and (
+            self.cache_time_h is None
+            or self.cache_time_h <= 0
+            or self.stale_cache_time_h <= self.cache_time_h
+        ):
+            raise ArgumentError(
+                "stale_cache_time_h must be greater than cache_time_h, "
+                "which must be greater than 0."
+            )
+
+        self.negative_cache_time = options.get("negative_cache_time", 10)
+        self.negative_cache_time_h = options.get(
+            "negative_cache_time_h", self.negative_cache_time
+        )
+        self.negative_cache_time_m = options.get(
+            "negative_cache_time_m", self.negative_cache_time
+        )
+
+        self.cache_errors_h = options.get("cache_errors_h", {})
+        self.cache_errors_m = options.get("cache_errors_m", None)
+        if self.cache_errors_m is None:
+            self.cache_errors_m = {PlayerNotFound: self.negative_cache_time_m}
+
+        self.cache_sweep_time = options.get("cache_sweep_time", None)
+
+        # Backends created here are closed with the client.
+        self._own_backends = []
+        self.cache_backend = options.get("cache_backend", None)
+        self.cache_backend_h = options.get("cache_backend_h", self.cache_backend)
+        if self.cache_backend_h is None:
+            self.cache_backend_h = MemoryCache(
+                self.cache_size_h, self.cache_sweep_time
+            )
+            self._own_backends.append(self.cache_backend_h)
+        self.cache_backend_m = options.get("cache_backend_m", self.cache_backend)
+        if self.cache_backend_m is None:
+            self.cache_backend_m = MemoryCache(
+                self.cache_size_m, self.cache_sweep_time
+            )
+            self._own_backends.append(self.cache_backend_m)
+        self._set_disk_max_age()
+
         self.rate_limit = options.get("rate_limit", True)
         self.rate_limit_h = options.get("rate_limit_h", self.rate_limit)
         self.rate_limit_m = options.get("rate_limit_m", self.rate_limit)
 
-        # self._session = options.get('session', None)
-        # if self._session is None:
-        self._session = aiohttp.ClientSession(
-            loop=self.loop,
-            timeout=aiohttp.ClientTimeout(
-                total=self.timeout,
-            ),
+        self.batch_uuids = options.get("batch_uuids", False)
+        self.batch_time = options.get("batch_time", 0.05)
+
+        self.identity_store = options.get("identity_store", None)
+
+        self.concurrency = options.get("concurrency", 10)
+        _check_concurrency(self.concurrency)
+
+        self.keep_raw = options.get("keep_raw", True)
+        _check_keep_raw(self.keep_raw, allow_none=False)
+
+        self.json_decoder = options.get("json_decoder", JSON_DECODER)
+
+        self._rate_limiter = utils.RateLimiter()
+        self._uuid_batcher = utils.Batcher(
+            self._get_uuids,
+            delay=self.batch_time,
+            max_size=10,  # Limit of the bulk profile endpoint
         )
 
+        self.connection_limit = options.get("connection_limit", 100)
+        self.connection_limit_per_host = options.get(
+            "connection_limit_per_host", 0
+        )
+        self.keepalive_timeout = options.get("keepalive_timeout", 15)
+        self.dns_cache_time = options.get("dns_cache_time", 10)
+        self.async_dns = options.get("async_dns", HAS_AIODNS)
+
+        self._session = options.get("session", None)
+        self._owns_session = self._session is None
+        if self._owns_session:
+            self._session = self._create_session()
+
         if self.autoverify and self._keys:
             self.validate_keys()
+        # Coalesce below the caches so concurrent cache misses are still
+        # shared.
+        if self.coalesce:
+            self._get = utils.single_flight(self._get)
+            self._get_uuid = utils.single_flight(self._get_uuid)
+            self._get_name = utils.single_flight(self._get_name)
         if self.cache_h:
-            self._get = utils.async_timed_cache(
+            self._get = utils.async_cache(
                 self._get,
+                self.cache_backend_h,
                 self.cache_time_h,
-                self.cache_size_h,
+                negative_max_age=self.negative_cache_time_h,
+                negative=_not_found,
+                errors=self.cache_errors_h,
+                stale_max_age=self.stale_cache_time_h,
+                # Requests made with a specific API key (key and
+                # validate_keys) would store it in the backend.
+                uncached=("key",),
             )
         if self.cache_m:
-            self._get_uuid = utils.async_timed_cache(
+            self._get_uuid = utils.async_cache(
                 self._get_uuid,
+                self.cache_backend_m,
                 self.cache_time_m,
-                self.cache_size_m,
+                errors=self.cache_errors_m,
             )
-            self._get_name = utils.async_timed_cache(
+            self._get_name = utils.async_cache(
                 self._get_name,
+                self.cache_backend_m,
                 self.cache_time_m,
-                self.cache_size_m,
+                errors=self.cache_errors_m,
             )
 
+    def _set_disk_max_age(self) -> None:
+        # Entries a DiskCache restores may have been written with a
+        # longer cache time than this run's, so they're capped at the
+        # longest time this client caches for.
+        ages = {}
+        if self.cache_h:
+            age = self.stale_cache_time_h or self.cache_time_h
+            ages.setdefault(id(self.cache_backend_h), []).append(age)
+        if self.cache_m:
+            age = self.cache_time_m
+            ages.setdefault(id(self.cache_backend_m), []).append(age)
+        for backend in (self.cache_backend_h, self.cache_backend_m):
+            if not isinstance(backend, DiskCache):
+                continue
+            if backend.max_age is not None or id(backend) not in ages:
+                continue
+            # None or a value less than or equal to 0 doesn't expire.
+            if all(age is not None and age > 0 for age in ages[id(backend)]):
+                backend.max_age = max(ages[id(backend)])
+
     @property
     def keys(self) -> List[str]:
         """List[:class:`str`]: A list of Hypixel API key(s) that were
@@ -275,42 +575,79 @@ class Client:
         return self._keys
 
     @property
-    def hypixel_cache_info(self) -> Optional[namedtuple]:
-        """:class:`type`: A named tuple that represents cache
-        information for all Hypixel API related methods.
+    def rate_limit_remaining(self) -> Optional[int]:
+        """Optional[:class:`int`]: The amount of Hypixel API requests
+        left in the current rate limit window.
+
+        ``None`` until a response with rate limit headers is received.
+        """
+        remaining = self._rate_limiter.remaining
+        if remaining is None:
+            return None
+        return max(remaining, 0)
+
+    @property
+    def hypixel_cache_info(self) -> Optional[CacheInfo]:
+        """Optional[:class:`CacheInfo`]: A named tuple that represents
+        cache information for all Hypixel API related methods.
 
         This is the same as ``functools.lru_cache.cache_info()``.
         Fields are ``hits``, ``misses``, ``maxsize``, and ``currsize``.
         All of which are an :class:`int` except ``maxsize`` which can
         also be ``None``.
+
+        ``None`` if ``self.cache_h`` is ``False``.
         """
-        if self.cache is None:
+        if not self.cache_h:
             return None
         return self._get.cache_info()
 
     @property
-    def mojang_cache_info(self) -> Optional[namedtuple]:
-        """:class:`type`: A named tuple that represents cache
-        information for all Mojang related methods.
+    def mojang_cache_info(self) -> Optional[CacheInfo]:
+        """Optional[:class:`CacheInfo`]: A named tuple that represents
+        cache information for all Mojang related methods.
 
         This is the same as ``functools.lru_cache.cache_info()``.
         Fields are ``hits``, ``misses``, ``maxsize``, and ``currsize``.
         All of which are an :class:`int` except ``maxsize`` which can
         also be ``None``.
+
+        ``None`` if ``self.cache_m`` is ``False``.
         """
-        if self.cache is None:
+        if not self.cache_m:
             return None
         return self._get_uuid.cache_info()
 
     async def __aenter__(self):
-        if self._session.closed:
-            self._session = aiohttp.ClientSession(loop=self.loop)
+        # A passed session stays closed; it's not ours to reopen.
+        if self._owns_session and self._session.closed:
+            self._session = self._create_session()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
         # Await but don't return
         # If a truthy value is returned, it suppresses exceptions
-        await self._session.close()
+        await self.close()
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        resolver = None
+        if self.async_dns:
+            resolver = aiohttp.AsyncResolver(loop=self.loop)
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_time,
+            resolver=resolver,
+            loop=self.loop,
+        )
+        return aiohttp.ClientSession(
+            loop=self.loop,
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=self.timeout,
+            ),
+        )
 
     def _next_key(self):
         if not self._keys:
@@ -326,9 +663,22 @@ class Client:
             f"https://api.mojang.com/users/profiles/minecraft/{name}"
         )
 
+    async def _read_json(self, response):
+        return self.json_decoder(await response.read())
+
+    async def _store_identity(self, name: str, uuid: str) -> None:
+        if self.identity_store is not None:
+            await self.identity_store.set(name, uuid)
+
     async def _get_uuid(self, name: str) -> str:
         if self._session.closed:
             raise ClosedSession
+        if self.identity_store is not None:
+            uuid = await self.identity_store.get_uuid(name)
+            if uuid is not None:
+                return uuid
+        if self.batch_uuids:
+            return await self._uuid_batcher.submit(name)
         try:
             response = await self._get_uuid_helper(name)
         except asyncio.TimeoutError:
@@ -339,17 +689,20 @@ class Client:
                 retry_after = None
                 raise RateLimitError(retry_after, "mojang", response)
             else:
+                # One backoff per request so retries wait longer and
+                # longer.
+                backoff = utils.ExponentialBackoff(self.timeout)
                 while response.status == 429:
-                    backoff = utils.ExponentialBackoff(self.timeout)
                     retry = backoff.delay()
                     await asyncio.sleep(retry)
                     response = await self._get_uuid_helper(name)
 
         if response.status == 200:
-            data = await response.json(loads=JSON_DECODER)
+            data = await self._read_json(response)
             uuid = data.get("id")
             if not uuid:
                 raise PlayerNotFound(name)
+            await self._store_identity(data.get("name", name), uuid)
             return uuid
 
         elif response.status == 404:
@@ -358,6 +711,62 @@ class Client:
         else:
             raise ApiError(response, "mojang")
 
+    async def _get_uuids_helper(self, names):
+        return await self._session.post(
+            "https://api.mojang.com/profiles/minecraft",
+            json=names,
+        )
+
+    async def _get_uuids(
+        self, names: List[str]
+    ) -> Dict[str, Union[str, PlayerNotFound]]:
+        if self._session.closed:
+            raise ClosedSession
+        results = {}
+        valid = []
+        for name in names:
+            if NAME_PATTERN.match(name):
+                valid.append(name)
+            else:
+                results[name] = PlayerNotFound(name)
+        if not valid:
+            return results
+
+        try:
+            response = await self._get_uuids_helper(valid)
+        except asyncio.TimeoutError:
+            raise TimeoutError("mojang")
+
+        if response.status == 429:
+            if not self.rate_limit_m:
+                retry_after = None
+                raise RateLimitError(retry_after, "mojang", response)
+            else:
+                backoff = utils.ExponentialBackoff(self.timeout)
+                while response.status == 429:
+                    retry = backoff.delay()
+                    await asyncio.sleep(retry)
+                    response = await self._get_uuids_helper(valid)
+
+        if response.status == 200:
+            data = await self._read_json(response)
+            # Names are case insensitive and unknown names are left out.
+            uuids = {
+                profile["name"].lower(): profile["id"] for profile in data
+            }
+            for profile in data:
+                await self._store_identity(profile["name"], profile["id"])
+            for name in valid:
+                uuid = uuids.get(name.lower())
+                if uuid is None:
+                    results[name] = PlayerNotFound(name)
+                else:
+                    results[name] = uuid
+            return results
+
+        else:
+            raise ApiError(response, "mojang")
+
     async def _get_name_helper(self, uuid):
         return await self._session.get(
             f'https://sessionserver.mojang.com/session/minecraft/profile/{uuid}'
@@ -366,6 +775,10 @@ class Client:
     async def _get_name(self, uuid: str) -> str:
         if self._session.closed:
             raise ClosedSession
+        if self.identity_store is not None:
+            name = await self.identity_store.get_name(uuid)
+            if name is not None:
+                return name
         try:
             response = await self._get_name_helper(uuid)
         except asyncio.TimeoutError:
@@ -376,17 +789,20 @@ class Client:
                 retry_after = None
                 raise RateLimitError(retry_after, "mojang", response)
             else:
+                # One backoff per request so retries wait longer and
+                # longer.
+                backoff = utils.ExponentialBackoff(self.timeout)
                 while response.status == 429:
-                    backoff = utils.ExponentialBackoff(self.timeout)
                     retry = backoff.delay()
                     await asyncio.sleep(retry)
                     response = await self._get_name_helper(uuid)
 
         if response.status == 200:
-            data = await response.json(loads=JSON_DECODER)
+            data = await self._read_json(response)
             name = data.get("name")
             if not name:
                 raise PlayerNotFound(uuid)
+            await self._store_identity(name, data.get("id", uuid))
             return name
 
         elif response.status == 404:
@@ -456,10 +872,13 @@ class Client:
                 raise KeyRequired(path)
             params["key"] = self._next_key()
 
+        if self.rate_limit_h:
+            await self._rate_limiter.acquire(self.timeout)
         try:
             response = await self._get_helper(path, params)
         except asyncio.TimeoutError:
             raise TimeoutError("hypixel")
+        self._rate_limiter.update(response.headers)
 
         if response.status == 429:
             if not self.rate_limit_h:
@@ -476,9 +895,10 @@ class Client:
                         raise TimeoutError("hypixel")
                     await asyncio.sleep(retry)
                     response = await self._get_helper(path, params)
+                    self._rate_limiter.update(response.headers)
 
         if response.status == 200:
-            return await response.json(loads=JSON_DECODER)
+            return await self._read_json(response)
 
         elif response.status == 403:
             if params.get("key") is None:
@@ -487,7 +907,7 @@ class Client:
 
         else:
             try:
-                text = await response.json(loads=JSON_DECODER)
+                text = await self._read_json(response)
                 text = text.get("cause")
             except Exception:
                 raise ApiError(response, "hypixel")
@@ -495,6 +915,56 @@ class Client:
                 text = f"An unexpected error occurred with the hypixel API: {text}"
                 raise ApiError(response, "hypixel", text)
 
+    def _apply_keep_raw(self, model, keep_raw):
+        if keep_raw is None:
+            keep_raw = self.keep_raw
+        return utils._apply_keep_raw(model, keep_raw)
+
+    async def _bulk(self, method, ids, concurrency, **kwargs):
+        if concurrency is None:
+            concurrency = self.concurrency
+        _check_concurrency(concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _run(id_):
+            async with semaphore:
+                return await method(id_, **kwargs)
+
+        # Dedupe while keeping the passed order
+        ids = list(dict.fromkeys(ids))
+        # Exceptions are returned instead of raised so that one failed
+        # id doesn't cancel the rest of the batch.
+        results = await asyncio.gather(
+            *(_run(id_) for id_ in ids),
+            return_exceptions=True,
+        )
+        return dict(zip(ids, results))
+
+    async def _bulk_iter(self, method, ids, concurrency, **kwargs):
+        # Same as _bulk, but yields (id, result) pairs as they complete.
+        if concurrency is None:
+            concurrency = self.concurrency
+        _check_concurrency(concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _run(id_):
+            async with semaphore:
+                try:
+                    return id_, await method(id_, **kwargs)
+                except Exception as exc:
+                    return id_, exc
+
+        tasks = [
+            asyncio.ensure_future(_run(id_)) for id_ in dict.fromkeys(ids)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # Stops the remaining requests if iteration ends early.
+            for task in tasks:
+                task.cancel()
+
     # Public
 
     async def close(self) -> None:
@@ -518,8 +988,17 @@ class Client:
             Calling a client method that requires an open aiohttp
             session after this is called will raise a
             :exc:`ClosedSession` exception.
+
+        .. note::
+
+            A session passed with the ``session`` option is not closed.
         """
-        await self._session.close()
+        if self.cache_h:
+            self._get.cancel_refreshes()
+        for backend in self._own_backends:
+            backend.close()
+        if self._owns_session:
+            await self._session.close()
 
     async def validate_keys(self) -> None:
         """Validates the keys passed into the client.
@@ -585,7 +1064,13 @@ class Client:
             raise MalformedApiKey(key)
 
     def clear_cache(self) -> None:
-        """Clear hypixel and mojang caches."""
+        """Clear hypixel and mojang caches.
+
+        .. note::
+
+            If both APIs share a cache backend, clearing either cache
+            clears both.
+        """
         if self.cache_h:
             self.clear_hypixel_cache()
         if self.cache_m:
@@ -637,7 +1122,8 @@ class Client:
         """
         if not isinstance(name, str):
             raise InvalidPlayerId(name)
-        return await self._get_uuid(name)
+        # Same call signature as utils.convert_id to share calls.
+        return await self._get_uuid(name=name)
 
     async def get_name(self, uuid: str) -> str:
         """Returns the username of a player from their uuid.
@@ -678,7 +1164,12 @@ class Client:
     # API (Hypixel)
 
     @utils.convert_id
-    async def player(self, id_: str) -> Player:
+    async def player(
+        self,
+        id_: str,
+        *,
+        keep_raw: Optional[Union[bool, str]] = None,
+    ) -> Player:
         """Returns player info.
 
         |hypixel|
@@ -693,11 +1184,17 @@ class Client:
         ----------
         id\\_: :class:`str`
             The username or uuid of a player.
+        keep_raw: Optional[Union[:class:`bool`, :class:`str`]]
+            Whether or not the model keeps the raw response. Refer to
+            the client's ``keep_raw`` option for more information.
+            Defaults to ``self.keep_raw``.
 
         Raises
         ------
         ApiError
             An unexpected error occurred with the Hypixel or Mojang API.
+        ArgumentError
+            ``keep_raw`` is not ``True``, ``False`` or ``'compact'``.
         ClosedSession
             ``self.ClientSession`` is closed.
         InvalidApiKey
@@ -719,6 +1216,7 @@ class Client:
         :class:`~hypixel.models.player.Player`
             A player model used to abstract data.
         """
+        _check_keep_raw(keep_raw)
         params = utils.HashedDict(uuid=id_["uuid"])
         response = await self._get("player", params=params)
 
@@ -731,7 +1229,59 @@ class Client:
         }
         clean_data = utils._clean(response["player"], mode="PLAYER")
         data.update(clean_data)
-        return Player(**data)
+        return self._apply_keep_raw(Player(**data), keep_raw)
+
+    async def players(
+        self,
+        ids: Iterable[str],
+        *,
+        concurrency: Optional[int] = None,
+        keep_raw: Optional[Union[bool, str]] = None,
+    ) -> Dict[str, Union[Player, Exception]]:
+        """Returns player info for multiple players at once.
+
+        |hypixel|
+
+        Requests are made concurrently with at most ``concurrency``
+        requests in flight at once. Duplicate ids are only requested
+        once.
+
+        .. note::
+
+            Errors are not raised. Instead, the exception raised for an
+            id (e.g. :exc:`PlayerNotFound` or :exc:`RateLimitError`) is
+            returned in place of its model so the rest of the batch
+            isn't affected. See :meth:`player` for the possible
+            exceptions.
+
+        Parameters
+        ----------
+        ids: Iterable[:class:`str`]
+            The usernames or uuids of the players.
+        concurrency: Optional[:class:`int`]
+            The maximum amount of requests in flight at once.
+            Defaults to ``self.concurrency``.
+        keep_raw: Optional[Union[:class:`bool`, :class:`str`]]
+            Whether or not the models keep the raw response. Refer to
+            the client's ``keep_raw`` option for more information.
+            Defaults to ``self.keep_raw``.
+
+        Returns
+        -------
+        Dict[:class:`str`, Union[:class:`~hypixel.models.player.Player`, :class:`Exception`]]
+            A dictionary of each passed id mapped to either its player
+            model or the exception that was raised.
+
+        Raises
+        ------
+        ArgumentError
+            ``concurrency`` is less than ``1`` or ``keep_raw`` is
+            invalid.
+        """
+        _check_keep_raw(keep_raw)
+        return await self._bulk(
+            self.player, ids, concurrency, keep_raw=keep_raw
+        )
 
     async def player_count(self) -> int:
         """Returns the number of players connected to Hypixel.
@@ -769,7 +1319,12 @@ class Client:
 
         return player_count
 
-    async def key(self, key: str) -> Key:
+    async def key(
+        self,
+        key: str,
+        *,
+        keep_raw: Optional[Union[bool, str]] = None,
+    ) -> Key:
         """Returns key info.
 
         |hypixel|
@@ -782,11 +1337,17 @@ class Client:
             .. note::
 
                 Can be passed with or without dashes.
+        keep_raw: Optional[Union[:class:`bool`, :class:`str`]]
+            Whether or not the model keeps the raw response. Refer to
+            the client's ``keep_raw`` option for more information.
+            Defaults to ``self.keep_raw``.
 
         Raises
         ------
         ApiError
             An unexpected error occurred with the Hypixel API.
+        ArgumentError
+            ``keep_raw`` is not ``True``, ``False`` or ``'compact'``.
         ClosedSession
             ``self.ClientSession`` is closed.
         InvalidApiKey
@@ -803,6 +1364,7 @@ class Client:
         :class:`~hypixel.Key`
             A key model used to abstract data.
         """
+        _check_keep_raw(keep_raw)
         if not isinstance(key, str):
             raise ArgumentError(f"Given key '{key}' is not a string.")
         try:
@@ -820,13 +1382,24 @@ class Client:
         }
         clean_data = utils._clean(response["record"], mode="KEY")
         data.update(clean_data)
-        return Key(**data)
+        return self._apply_keep_raw(Key(**data), keep_raw)
 
-    async def bans(self) -> Bans:
+    async def bans(
+        self,
+        *,
+        keep_raw: Optional[Union[bool, str]] = None,
+    ) -> Bans:
         """Returns staff and watchdog ban info.
 
         |hypixel|
 
+        Parameters
+        ----------
+        keep_raw: Optional[Union[:class:`bool`, :class:`str`]]
+            Whether or not the model keeps the raw response. Refer to
+            the client's ``keep_raw`` option for more information.
+            Defaults to ``self.keep_raw``.
+
         Raises
         ------
         ApiError
@@ -849,6 +1422,7 @@ class Client:
         :class:`~hypixel.Bans`
             A ban model used to abstract data.
         """
+        _check_keep_raw(keep_raw)
         response = await self._get("watchdogstats")
 
         data = {
@@ -856,7 +1430,7 @@ class Client:
         }
         clean_data = utils._clean(response, mode="BANS")
         data.update(clean_data)
-        return Bans(**data)
+        return self._apply_keep_raw(Bans(**data), keep_raw)
 
     # @utils.convert_id
     # async def player_friends(self, id_: str, sort=False) -> List[Friend]:
@@ -931,8 +1505,14 @@ class Client:
     #     return friends
 
     @utils.convert_id
-    async def player_status(self, id_: str) -> Status:
+    async def player_status(
+        self,
+        id_: str,
+        *,
+        keep_raw: Optional[Union[bool, str]] = None,
+    ) -> Status:
         """Get the status of a player."""
+        _check_keep_raw(keep_raw)
         params = utils.HashedDict(uuid=id_["uuid"])
         response = await self._get("status", params=params)
 
@@ -946,7 +1526,24 @@ class Client:
         }
         clean_data = utils._clean(session, mode="STATUS")
         data.update(clean_data)
-        return Status(**data)
+        return self._apply_keep_raw(Status(**data), keep_raw)
+
+    async def player_statuses(
+        self,
+        ids: Iterable[str],
+        *,
+        concurrency: Optional[int] = None,
+        keep_raw: Optional[Union[bool, str]] = None,
+    ) -> Dict[str, Union[Status, Exception]]:
+        """Get the statuses of multiple players at once.
+
+        Works the same as :meth:`players`, but for
+        :meth:`player_status`.
+        """
+        _check_keep_raw(keep_raw)
+        return await self._bulk(
+            self.player_status, ids, concurrency, keep_raw=keep_raw
+        )
 
     async def guild_from_id(self, id_: str) -> Guild:
         """Get a guild from the id."""
@@ -979,6 +1576,19 @@ class Client:
         data.update(clean_data)
         return Guild(**data)
 
+    async def guilds_from_players(
+        self,
+        ids: Iterable[str],
+        *,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Union[Guild, Exception]]:
+        """Get the guilds of multiple players at once.
+
+        Works the same as :meth:`players`, but for
+        :meth:`guild_from_player`.
+        """
+        return await self._bulk(self.guild_from_player, ids, concurrency)
+
     async def guild_from_name(self, name: str) -> Guild:
         """Get a guild from the name."""
         params = utils.HashedDict(name=name)
@@ -994,6 +1604,204 @@ class Client:
         data.update(clean_data)
         return Guild(**data)
 
+    async def guild_member_names(
+        self,
+        guild: Guild,
+        *,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Union[str, Exception]]:
+        """Resolves the names of a guild's members.
+
+        |mojang|
+
+        :attr:`GuildMember.name` is a legacy field that's usually
+        ``None``. This requests every member's name concurrently, with
+        at most ``concurrency`` requests in flight at once, and sets it
+        on each member, so ``guild.members`` can be rendered once this
+        returns. Names are cached and rate limits are handled the same
+        as :meth:`get_name`.
+
+        .. note::
+
+            Errors are not raised. Instead, the exception raised for a
+            member (e.g. :exc:`PlayerNotFound` or
+            :exc:`RateLimitError`) is returned in place of its name and
+            the member's name is left unchanged. See :meth:`get_name`
+            for the possible exceptions.
+
+        Parameters
+        ----------
+        guild: :class:`~hypixel.models.guild.Guild`
+            The guild whose members' names are resolved.
+        concurrency: Optional[:class:`int`]
+            The maximum amount of requests in flight at once.
+            Defaults to ``self.concurrency``.
+
+        Returns
+        -------
+        Dict[:class:`str`, Union[:class:`str`, :class:`Exception`]]
+            A dictionary of each member's uuid mapped to either their
+            name or the exception that was raised.
+
+        Raises
+        ------
+        ArgumentError
+            ``concurrency`` is less than ``1``.
+        """
+        names = {}
+        async for member, name in self.iter_guild_member_names(
+            guild, concurrency=concurrency
+        ):
+            names[member.uuid] = name
+        # In the guild's order instead of completion order.
+        return {member.uuid: names[member.uuid] for member in guild.members}
+
+    async def iter_guild_member_names(
+        self,
+        guild: Guild,
+        *,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[GuildMember, Union[str, Exception]]]:
+        """Resolves the names of a guild's members, yielding each member
+        as soon as their name arrives.
+
+        |mojang|
+
+        Works the same as :meth:`guild_member_names`, but members are
+        yielded in the order their requests complete. Requests that
+        haven't completed are cancelled if iteration stops early.
+
+        Parameters
+        ----------
+        guild: :class:`~hypixel.models.guild.Guild`
+            The guild whose members' names are resolved.
+        concurrency: Optional[:class:`int`]
+            The maximum amount of requests in flight at once.
+            Defaults to ``self.concurrency``.
+
+        Yields
+        ------
+        Tuple[:class:`~hypixel.models.guild.GuildMember`, Union[:class:`str`, :class:`Exception`]]
+            A member, with its name set if it was resolved, and either
+            their name or the exception that was raised.
+        """
+        members = {}
+        for member in guild.members:
+            members.setdefault(member.uuid, []).append(member)
+        async for uuid, name in self._bulk_iter(
+            self.get_name, members, concurrency
+        ):
+            for member in members[uuid]:
+                if isinstance(name, str):
+                    member.name = name
+                yield member, name
+
+    async def guild_players(
+        self,
+        guild: Guild,
+        *,
+        window: Optional[int] = None,
+        order: Literal["completion", "rank"] = "completion",
+        keep_raw: Optional[Union[bool, str]] = None,
+    ) -> AsyncIterator[Tuple[GuildMember, Union[Player, Exception]]]:
+        """Yields the player of each of a guild's members as their
+        requests complete.
+
+        |hypixel|
+
+        At most ``window`` requests are started ahead of the members
+        that have been yielded, so reports can be rendered
+        progressively without requesting the whole guild at once.
+        Requests that haven't completed are cancelled if iteration
+        stops early.
+
+        .. note::
+
+            Errors are not raised. Instead, the exception raised for a
+            member (e.g. :exc:`PlayerNotFound` or
+            :exc:`RateLimitError`) is yielded in place of its model.
+            See :meth:`player` for the possible exceptions.
+
+        Parameters
+        ----------
+        guild: :class:`~hypixel.models.guild.Guild`
+            The guild whose members are requested.
+        window: Optional[:class:`int`]
+            The maximum amount of requests started ahead of the members
+            that have been yielded. Defaults to ``self.concurrency``.
+        order: :class:`str`
+            ``'completion'`` to yield members as soon as their requests
+            complete, or ``'rank'`` to yield them from the highest rank
+            to the lowest, in roster order within a rank. Defaults to
+            ``'completion'``.
+        keep_raw: Optional[Union[:class:`bool`, :class:`str`]]
+            Whether or not the models keep the raw response. Refer to
+            the client's ``keep_raw`` option for more information.
+            Defaults to ``self.keep_raw``.
+
+        Raises
+        ------
+        ArgumentError
+            ``order`` is not ``'completion'`` or ``'rank'``, or
+            ``window`` is less than ``1``.
+
+        Yields
+        ------
+        Tuple[:class:`~hypixel.models.guild.GuildMember`, Union[:class:`~hypixel.models.player.Player`, :class:`Exception`]]
+            A member and either their player model or the exception
+            that was raised.
+        """
+        _check_keep_raw(keep_raw)
+        if order not in ("completion", "rank"):
+            raise ArgumentError(
+                f"Order must be 'completion' or 'rank', not '{order}'."
+            )
+        if window is None:
+            window = self.concurrency
+        if window < 1:
+            raise ArgumentError("Window must be at least 1.")
+
+        members = list(guild.members)
+        if order == "rank":
+            members.sort(key=_rank_order)
+        members = iter(members)
+
+        async def _run(member):
+            try:
+                return member, await self.player(
+                    member.uuid, keep_raw=keep_raw
+                )
+            except Exception as exc:
+                return member, exc
+
+        def _start():
+            # Starts the next member's request, if there is one.
+            member = next(members, None)
+            if member is not None:
+                tasks.append(asyncio.ensure_future(_run(member)))
+
+        tasks = []
+        for _ in range(window):
+            _start()
+        try:
+            while tasks:
+                if order == "rank":
+                    task = tasks[0]
+                    await asyncio.wait((task,))
+                else:
+                    done, _ = await asyncio.wait(
+                        tasks, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    # Keeps the roster order between requests that
+                    # completed together.
+                    task = next(task for task in tasks if task in done)
+                tasks.remove(task)
+                _start()
+                yield task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def leaderboards(self) -> Dict[str, List[Leaderboard]]:
         """Get the game leaderboards."""
         response = await self._get("leaderboards")
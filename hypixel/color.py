@@ -5,7 +5,6 @@ MIT License, see LICENSE for more details.
 
 from __future__ import annotations
 from dataclasses import dataclass
-import functools
 from typing import Optional
 
 __all__ = [
@@ -13,10 +12,13 @@ __all__ = [
 ]
 
 
-@dataclass
+@dataclass(frozen=True)
 class Color:
     """Represents a Minecraft color.
 
+    Colors are immutable and there is one instance per color, so they
+    can be compared with ``is`` and used as dictionary keys.
+
     Attributes
     ----------
     type_name: :class:`str`
@@ -38,9 +40,8 @@ class Color:
     drop_shadow: str
 
     @classmethod
-    @functools.lru_cache()
     def from_type(cls, type_name: str) -> Optional[Color]:
-        """Constructs a :class:`Color` from its type name.
+        """Returns the :class:`Color` of a type name.
 
         Parameters
         ----------
@@ -50,15 +51,9 @@ class Color:
         Returns
         -------
         Optional[:class:`Color`]
-            The constructed color object, or ``None`` if the type name
-            is invalid.
+            The color object, or ``None`` if the type name is invalid.
         """
-        data = next(
-            (item for item in COLOR_TYPES if item["type_name"] == type_name), None
-        )
-        if not data:
-            return None
-        return cls(**data)
+        return _COLORS_BY_TYPE.get(type_name)
 
 
 COLOR_TYPES = [
@@ -175,3 +170,6 @@ COLOR_TYPES = [
         "drop_shadow": "010101",
     },
 ]
+
+# Every color is created once, here.
+_COLORS_BY_TYPE = {item["type_name"]: Color(**item) for item in COLOR_TYPES}
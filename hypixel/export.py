@@ -0,0 +1,361 @@
+"""
+Copyright (c) 2021-present duhby
+MIT License, see LICENSE for more details.
+"""
+
+import csv
+from datetime import datetime
+from functools import reduce
+from itertools import islice
+import os
+import tempfile
+from typing import Dict, Iterable, Iterator, Mapping, Sequence, Union
+import zipfile
+
+from . import aliases
+from .errors import ArgumentError
+from .levels import (
+    _numpy,
+    network_levels,
+    skywars_levels,
+    uhc_levels,
+    wool_wars_levels,
+)
+from .models.player import Player
+from .models.player import aliases as mode_aliases
+from .models.player.utils import EXTRACTORS
+
+__all__ = [
+    'export_players',
+    'player_columns',
+]
+
+# Player attribute -> alias table name format of its game model's modes.
+SUBMODES = {
+    'arcade': '{}',
+    'bedwars': 'BEDWARS_{}',
+    'duels': '{}_DUELS',
+    'murder_mystery': 'MM_{}',
+    'skywars': 'SKYWARS_{}',
+    'uhc': 'UHC_{}',
+    'wool_games': 'WOOL_GAMES_{}',
+}
+
+# Column -> (batch level function, column it's calculated from).
+LEVELS = {
+    'level': (network_levels, 'network_exp'),
+    'skywars.level': (skywars_levels, 'skywars.exp'),
+    'uhc.level': (uhc_levels, 'uhc.score'),
+    'wool_games.level': (wool_wars_levels, 'wool_games.exp'),
+}
+
+# Ratio attribute -> (numerator, denominator) attributes. Any mode with
+# both attributes has the ratio.
+RATIOS = {
+    'kdr': ('kills', 'deaths'),
+    'wlr': ('wins', 'losses'),
+    'fkdr': ('final_kills', 'final_deaths'),
+    'bblr': ('beds_broken', 'beds_lost'),
+}
+
+Players = Iterable[Union[Player, dict]]
+Columns = Union[Sequence[str], Mapping[str, object]]
+
+
+def _tables(column: str) -> tuple:
+    # 'bedwars.solo.wins' -> ('BEDWARS', 'BEDWARS_SOLO'), 'wins'
+    *modes, key = column.split('.')
+    if len(modes) > 2 or (len(modes) == 2 and modes[0] not in SUBMODES):
+        raise ArgumentError(f"Unknown column '{column}'.")
+    tables = ()
+    if modes:
+        tables += (modes[0].upper(),)
+    if len(modes) == 2:
+        tables += (SUBMODES[modes[0]].format(modes[1].upper()),)
+    return tables, key
+
+def _field(column: str) -> tuple:
+    tables, key = _tables(column)
+    if not tables:
+        alias = aliases.PLAYER
+    elif tables[-1] in EXTRACTORS:
+        alias = getattr(mode_aliases, tables[-1])
+    else:
+        alias = {}
+    if key == '_data' or key not in alias.values():
+        raise ArgumentError(f"Unknown column '{column}'.")
+    return tables, key
+
+def _resolve(columns: Columns, np) -> tuple:
+    # Returns the fields read from the documents and the columns
+    # calculated from them.
+    if not isinstance(columns, Mapping):
+        columns = dict.fromkeys(columns, np.float64)
+    if not columns:
+        raise ArgumentError('At least one column is required.')
+
+    output = {}
+    fields = {}
+    derived = {}
+    for column, dtype in columns.items():
+        dtype = np.dtype(dtype)
+        if dtype.hasobject:
+            raise ArgumentError(
+                f"Column '{column}' must have a fixed size dtype."
+            )
+        output[column] = dtype
+
+        prefix, _, name = column.rpartition('.')
+        if column in LEVELS:
+            function, source = LEVELS[column]
+            sources = (source,)
+        elif name in RATIOS:
+            function = _ratio
+            sources = tuple(
+                f'{prefix}.{key}' if prefix else key for key in RATIOS[name]
+            )
+        else:
+            fields[column] = _field(column) + (dtype,)
+            continue
+
+        for source in sources:
+            if source not in fields:
+                fields[source] = _field(source) + (np.dtype(np.float64),)
+        derived[column] = (function, sources)
+
+    # Requested columns keep their dtype even if they're also a source.
+    for column, dtype in output.items():
+        if column in fields:
+            fields[column] = fields[column][:2] + (dtype,)
+    return output, fields, derived
+
+def _check_chunk_size(chunk_size: int) -> None:
+    if chunk_size < 1:
+        raise ArgumentError('Chunk size must be at least 1.')
+
+def _ratio(a, b):
+    # Same as utils.safe_div: dividing by 0 returns the numerator.
+    np = _numpy()
+    a = a.astype(np.float64)
+    return np.where(b == 0, a, np.round(a / np.where(b == 0, 1, b), 2))
+
+def _document(item) -> Union[dict, Player, None]:
+    if isinstance(item, Player):
+        # Players built with keep_raw=False have no data left to read,
+        # so their attributes are read instead.
+        return item if item._data is None else item._data
+    if 'player' in item:
+        return item['player']
+    return item
+
+def _modes(document: dict, paths: Sequence[tuple]) -> dict:
+    # Each mode's aliased data, extracted once per document. Paths are
+    # sorted so a mode's parent is extracted before it.
+    found = {(): {
+        new: document[old]
+        for old, new in aliases.PLAYER.items() if old in document
+    }}
+    for path in paths:
+        if len(path) == 1:
+            found[path] = EXTRACTORS[path[0]](document)
+        else:
+            parent = found[path[:-1]].get('_data', {})
+            found[path] = EXTRACTORS[path[-1]](parent)
+    return found
+
+def player_columns(
+    players: Players,
+    columns: Columns,
+    chunk_size: int = 10000,
+) -> Iterator[Dict[str, 'numpy.ndarray']]:
+    """Yields player stats as columns of NumPy arrays, ``chunk_size``
+    players at a time.
+
+    Values are read straight from the API data using the models' alias
+    tables, so game models aren't built.
+
+    |numpy|
+
+    Parameters
+    ----------
+    players: Iterable[Union[:class:`~hypixel.Player`, :class:`dict`]]
+        Players or raw player responses. A raw response can be the
+        whole response or only its ``player`` dictionary. Responses
+        for players that don't exist are skipped.
+    columns: Union[Sequence[:class:`str`], Mapping[:class:`str`, :class:`numpy.dtype`]]
+        The columns to export, as attribute paths of
+        :class:`~hypixel.Player`, e.g. ``'network_exp'``,
+        ``'bedwars.fkdr'`` or ``'duels.classic.wins'``. Player
+        attributes that are in its alias tables, ``kdr``, ``wlr``,
+        ``fkdr`` and ``bblr`` ratios, and the network, skywars, uhc and
+        wool games levels are supported. Pass a mapping of columns to
+        dtypes to choose each column's type; sequences of columns are
+        ``float64``.
+    chunk_size: :class:`int`
+        The maximum number of players in each chunk. Defaults to
+        ``10000``.
+
+    Yields
+    ------
+    Dict[:class:`str`, :class:`numpy.ndarray`]
+        Each column's values for the players in a chunk. Missing
+        values are ``0``, or empty strings for string columns. Times
+        such as ``first_login`` are in epoch milliseconds, as in the
+        API data, for every kind of player passed.
+
+    Raises
+    ------
+    ArgumentError
+        A column is not supported or has an object dtype, or
+        ``chunk_size`` is less than ``1``.
+    """
+    _check_chunk_size(chunk_size)
+    np = _numpy()
+    output, fields, derived = _resolve(columns, np)
+    paths = sorted({
+        tables[:i]
+        for tables, _, _ in fields.values()
+        for i in range(1, len(tables) + 1)
+    }, key=len)
+    attributes = {column: column.split('.') for column in fields}
+
+    players = iter(players)
+    while True:
+        arrays = {
+            column: np.zeros(chunk_size, dtype)
+            for column, (_, _, dtype) in fields.items()
+        }
+        rows = 0
+        read = 0
+        for item in islice(players, chunk_size):
+            read += 1
+            document = _document(item)
+            if document is None:
+                continue
+            if isinstance(document, Player):
+                for column, names in attributes.items():
+                    value = reduce(getattr, names, document)
+                    if isinstance(value, datetime):
+                        # Raw data has times as epoch milliseconds.
+                        value = round(value.timestamp() * 1000)
+                    if value is not None:
+                        arrays[column][rows] = value
+            else:
+                modes = _modes(document, paths)
+                for column, (tables, key, _) in fields.items():
+                    value = modes[tables].get(key)
+                    if value is not None:
+                        arrays[column][rows] = value
+            rows += 1
+        if not read:
+            return
+        if not rows:
+            continue
+
+        arrays = {column: array[:rows] for column, array in arrays.items()}
+        chunk = {}
+        for column, dtype in output.items():
+            if column in derived:
+                function, sources = derived[column]
+                values = function(*(arrays[source] for source in sources))
+                chunk[column] = values.astype(dtype, copy=False)
+            else:
+                chunk[column] = arrays[column]
+        yield chunk
+
+def _write_csv(path, names, chunks) -> int:
+    count = 0
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(names)
+        for chunk in chunks:
+            writer.writerows(zip(*(chunk[name].tolist() for name in names)))
+            count += len(chunk[names[0]])
+    return count
+
+def _write_npz(path, output, chunks) -> int:
+    np = _numpy()
+    count = 0
+    # Chunks are appended to a file per column, which are copied into
+    # the archive once the number of rows is known.
+    with tempfile.TemporaryDirectory() as directory:
+        files = {
+            name: open(os.path.join(directory, str(i)), 'wb')
+            for i, name in enumerate(output)
+        }
+        try:
+            for chunk in chunks:
+                for name, file in files.items():
+                    file.write(chunk[name].tobytes())
+                count += len(next(iter(chunk.values())))
+        finally:
+            for file in files.values():
+                file.close()
+
+        with zipfile.ZipFile(path, 'w', allowZip64=True) as archive:
+            for name, dtype in output.items():
+                if count:
+                    array = np.memmap(
+                        files[name].name, dtype=dtype, mode='r',
+                        shape=(count,),
+                    )
+                else:
+                    array = np.empty(0, dtype)
+                with archive.open(f'{name}.npy', 'w',
+                                  force_zip64=True) as file:
+                    np.lib.format.write_array(file, array)
+                del array
+    return count
+
+def export_players(
+    players: Players,
+    path: Union[str, os.PathLike],
+    columns: Columns,
+    chunk_size: int = 10000,
+) -> int:
+    """Writes player stats to a ``.npz`` or ``.csv`` file,
+    ``chunk_size`` players at a time.
+
+    Only one chunk is held in memory at a time, so large iterables of
+    players are exported in bounded memory. NPZ files hold an array
+    per column and can be read with :func:`numpy.load`.
+
+    |numpy|
+
+    Parameters
+    ----------
+    players: Iterable[Union[:class:`~hypixel.Player`, :class:`dict`]]
+        Players or raw player responses. Refer to
+        :func:`player_columns`.
+    path: Union[:class:`str`, :class:`os.PathLike`]
+        The file to write. Its suffix chooses the format.
+    columns: Union[Sequence[:class:`str`], Mapping[:class:`str`, :class:`numpy.dtype`]]
+        The columns to export. Refer to :func:`player_columns`.
+    chunk_size: :class:`int`
+        The maximum number of players in each chunk. Defaults to
+        ``10000``.
+
+    Returns
+    -------
+    :class:`int`
+        The number of players written.
+
+    Raises
+    ------
+    ArgumentError
+        The path's suffix isn't ``.npz`` or ``.csv``, a column is not
+        supported, or ``chunk_size`` is less than ``1``.
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in ('.csv', '.npz'):
+        raise ArgumentError(
+            f"Unsupported export format '{suffix}', use .npz or .csv."
+        )
+    _check_chunk_size(chunk_size)
+    np = _numpy()
+    # Resolved first so bad columns raise before the file is created.
+    output = _resolve(columns, np)[0]
+    chunks = player_columns(players, columns, chunk_size)
+    if suffix == '.csv':
+        return _write_csv(path, list(output), chunks)
+    return _write_npz(path, output, chunks)
@@ -5,7 +5,6 @@ MIT License, see LICENSE for more details.
 
 from __future__ import annotations
 from dataclasses import dataclass
-import functools
 from typing import Optional
 
 __all__ = [
@@ -13,10 +12,13 @@ __all__ = [
 ]
 
 
-@dataclass
+@dataclass(frozen=True)
 class Game:
     """Represents a Hypixel game.
 
+    Games are immutable and there is one instance per game, so they can
+    be compared with ``is`` and used as dictionary keys.
+
     Attributes
     ----------
     id: :class:`int`
@@ -45,9 +47,8 @@ class Game:
     legacy: bool = False
 
     @classmethod
-    @functools.lru_cache()
     def from_type(cls, type_name: str) -> Optional[Game]:
-        """Constructs a :class:`Game` from its type name.
+        """Returns the :class:`Game` of a type name.
 
         Parameters
         ----------
@@ -57,20 +58,13 @@ class Game:
         Returns
         -------
         Optional[:class:`Game`]
-            The constructed game object, or ``None`` if the type name
-            is invalid.
+            The game object, or ``None`` if the type name is invalid.
         """
-        data = next((
-            item for item in GAME_TYPES if item['type_name'] == type_name
-        ), None)
-        if not data:
-            return None
-        return cls(**data)
+        return _GAMES_BY_TYPE.get(type_name)
 
     @classmethod
-    @functools.lru_cache()
     def from_id(cls, id_: int) -> Optional[Game]:
-        """Constructs a :class:`Game` from its id.
+        """Returns the :class:`Game` of an id.
 
         Parameters
         ----------
@@ -80,15 +74,9 @@ class Game:
         Returns
         -------
         Optional[:class:`Game`]
-            The constructed game object, or ``None`` if the id is
-            invalid.
+            The game object, or ``None`` if the id is invalid.
         """
-        data = next((
-            item for item in GAME_TYPES if item['id'] == id_
-        ), None)
-        if not data:
-            return None
-        return cls(**data)
+        return _GAMES_BY_ID.get(id_)
 
 GAME_TYPES = [
   {
@@ -309,3 +297,7 @@ GAME_TYPES = [
     'standard_name': 'Wool Games',
   },
 ]
+
+# Every game is created once, here.
+_GAMES_BY_TYPE = {item['type_name']: Game(**item) for item in GAME_TYPES}
+_GAMES_BY_ID = {game.id: game for game in _GAMES_BY_TYPE.values()}
@@ -0,0 +1,330 @@
+"""
+Copyright (c) 2021-present duhby
+MIT License, see LICENSE for more details.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__all__ = [
+    'guild_level',
+    'guild_levels',
+    'network_level',
+    'network_levels',
+    'skywars_level',
+    'skywars_levels',
+    'uhc_level',
+    'uhc_levels',
+    'wool_wars_level',
+    'wool_wars_levels',
+]
+
+
+# Experience needed for each of the first 15 guild levels. Every level
+# after that needs the last amount.
+GUILD_EXP = (100000, 150000, 250000, 500000, 750000, 1000000, 1250000,
+             1500000, 2000000, 2500000, 2500000, 2500000, 2500000, 2500000,
+             3000000)
+# Total experience needed for each of the first 15 guild levels.
+GUILD_TOTALS = tuple(accumulate(GUILD_EXP))
+GUILD_MAX_LEVEL = 1000
+
+# Experience needed for the first 4 levels of a prestige. Shared by the
+# bedwars and wool wars level curves.
+PRESTIGE_EXP = (500, 1000, 2000, 3500)
+PRESTIGE_TOTALS = tuple(accumulate(PRESTIGE_EXP))
+PRESTIGE_LEVEL_EXP = 5000
+PRESTIGE_TOTAL_EXP = 487000
+
+# The skywars and uhc tables are from The Slothpixel Project (MIT License,
+# Copyright (c) 2018 The Slothpixel Project).
+
+# Total experience needed for each of the first 12 skywars levels.
+SKYWARS_TOTALS = (0, 20, 70, 150, 250, 500, 1000, 2000, 3500, 6000, 10000,
+                  15000)
+SKYWARS_LEVEL_EXP = 10000
+
+# Score needed for each uhc level.
+UHC_TOTALS = (0, 10, 60, 210, 460, 960, 1710, 2710, 5210, 10210, 13210,
+              16210, 19210, 22210, 25210)
+
+
+def _numpy():
+    if np is None:
+        raise ImportError(
+            'numpy is required for this function: pip install numpy'
+        )
+    return np
+
+
+def network_level(exp: float) -> float:
+    """Returns the Hypixel network level of an amount of network
+    experience, rounded to 2 decimal places.
+
+    Parameters
+    ----------
+    exp: :class:`float`
+        The network experience.
+
+    Returns
+    -------
+    :class:`float`
+        The network level.
+    """
+    return round(1 + (-8750.0 + (8750 ** 2 + 5000 * exp) ** 0.5) / 2500, 2)
+
+
+def guild_level(exp: float) -> float:
+    """Returns the level of a guild with an amount of experience,
+    rounded to 2 decimal places. Levels are capped at ``1000``.
+
+    Parameters
+    ----------
+    exp: :class:`float`
+        The guild experience.
+
+    Returns
+    -------
+    :class:`float`
+        The guild level.
+    """
+    if exp < GUILD_TOTALS[-1]:
+        level = bisect_right(GUILD_TOTALS, exp)
+        exp -= GUILD_TOTALS[level - 1] if level else 0
+        need = GUILD_EXP[level]
+    else:
+        need = GUILD_EXP[-1]
+        extra, exp = divmod(exp - GUILD_TOTALS[-1], need)
+        level = len(GUILD_EXP) + int(extra)
+    if level > GUILD_MAX_LEVEL:
+        return GUILD_MAX_LEVEL
+    return round((level + exp / need) * 100) / 100
+
+
+def wool_wars_level(exp: float) -> float:
+    """Returns the level of an amount of experience on the prestige
+    curve used by wool wars and bedwars, rounded to 2 decimal places.
+
+    Parameters
+    ----------
+    exp: :class:`float`
+        The experience.
+
+    Returns
+    -------
+    :class:`float`
+        The level.
+    """
+    prestiges, exp = divmod(exp, PRESTIGE_TOTAL_EXP)
+    level = prestiges * 100
+    if exp < PRESTIGE_TOTALS[-1]:
+        completed = bisect_right(PRESTIGE_TOTALS, exp)
+        level += completed
+        exp -= PRESTIGE_TOTALS[completed - 1] if completed else 0
+    else:
+        extra, exp = divmod(exp - PRESTIGE_TOTALS[-1], PRESTIGE_LEVEL_EXP)
+        level += len(PRESTIGE_EXP) + extra
+
+    next_level = (level + 1) % 100
+    if 1 <= next_level <= len(PRESTIGE_EXP):
+        need = PRESTIGE_EXP[int(next_level) - 1]
+    else:
+        need = PRESTIGE_LEVEL_EXP
+    return round(level + exp / need, 2)
+
+
+def skywars_level(exp: float) -> float:
+    """Returns the skywars level of an amount of skywars experience.
+
+    Parameters
+    ----------
+    exp: :class:`float`
+        The skywars experience.
+
+    Returns
+    -------
+    :class:`float`
+        The skywars level.
+    """
+    if exp >= SKYWARS_TOTALS[-1]:
+        return (exp - SKYWARS_TOTALS[-1]) / SKYWARS_LEVEL_EXP + 12
+    i = bisect_right(SKYWARS_TOTALS, exp)
+    previous = SKYWARS_TOTALS[i - 1]
+    return i + (exp - previous) / (SKYWARS_TOTALS[i] - previous)
+
+
+def uhc_level(score: float) -> int:
+    """Returns the uhc level of an amount of uhc score.
+
+    Parameters
+    ----------
+    score: :class:`float`
+        The uhc score.
+
+    Returns
+    -------
+    :class:`int`
+        The uhc level.
+    """
+    return bisect_right(UHC_TOTALS, score)
+
+
+def network_levels(exp):
+    """Batch version of :func:`network_level`.
+
+    Levels are rounded with :func:`numpy.round`, which can differ from
+    the scalar function by ``0.01`` when a level falls exactly halfway
+    between two hundredths.
+
+    |numpy|
+
+    Parameters
+    ----------
+    exp: :class:`numpy.ndarray`
+        The network experience values. Anything
+        :func:`numpy.asarray` accepts can be passed.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The network levels as floats.
+    """
+    np = _numpy()
+    exp = np.asarray(exp, dtype=np.float64)
+    return np.round(1 + (-8750.0 + np.sqrt(8750 ** 2 + 5000 * exp)) / 2500, 2)
+
+
+def guild_levels(exp):
+    """Batch version of :func:`guild_level`.
+
+    |numpy|
+
+    Parameters
+    ----------
+    exp: :class:`numpy.ndarray`
+        The guild experience values. Anything :func:`numpy.asarray`
+        accepts can be passed.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The guild levels as floats.
+    """
+    np = _numpy()
+    exp = np.asarray(exp, dtype=np.float64)
+    totals = np.array((0,) + GUILD_TOTALS, dtype=np.float64)
+    needs = np.array(GUILD_EXP, dtype=np.float64)
+
+    early = exp < totals[-1]
+    # Clipped so the late values index the arrays too.
+    level = np.searchsorted(totals[1:], exp, side='right').clip(
+        max=len(GUILD_EXP) - 1
+    )
+    rest = exp - totals[level]
+    need = needs[level]
+
+    late_level, late_rest = np.divmod(exp - totals[-1], needs[-1])
+    level = np.where(early, level, late_level + len(GUILD_EXP))
+    rest = np.where(early, rest, late_rest)
+    need = np.where(early, need, needs[-1])
+
+    levels = np.round((level + rest / need) * 100) / 100
+    return np.where(level > GUILD_MAX_LEVEL, GUILD_MAX_LEVEL, levels)
+
+
+def wool_wars_levels(exp):
+    """Batch version of :func:`wool_wars_level`.
+
+    Levels are rounded with :func:`numpy.round`, which can differ from
+    the scalar function by ``0.01`` when a level falls exactly halfway
+    between two hundredths.
+
+    |numpy|
+
+    Parameters
+    ----------
+    exp: :class:`numpy.ndarray`
+        The experience values. Anything :func:`numpy.asarray` accepts
+        can be passed.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The levels as floats.
+    """
+    np = _numpy()
+    exp = np.asarray(exp, dtype=np.float64)
+    totals = np.array((0,) + PRESTIGE_TOTALS, dtype=np.float64)
+
+    prestiges, exp = np.divmod(exp, PRESTIGE_TOTAL_EXP)
+    early = exp < totals[-1]
+    completed = np.searchsorted(totals[1:], exp, side='right').clip(
+        max=len(PRESTIGE_EXP)
+    )
+    extra, late_rest = np.divmod(exp - totals[-1], PRESTIGE_LEVEL_EXP)
+    level = prestiges * 100 + np.where(
+        early, completed, len(PRESTIGE_EXP) + extra
+    )
+    rest = np.where(early, exp - totals[completed], late_rest)
+
+    needs = np.full(100, PRESTIGE_LEVEL_EXP, dtype=np.float64)
+    needs[1:len(PRESTIGE_EXP) + 1] = PRESTIGE_EXP
+    need = needs[((level + 1) % 100).astype(np.intp)]
+    return np.round(level + rest / need, 2)
+
+
+def skywars_levels(exp):
+    """Batch version of :func:`skywars_level`.
+
+    |numpy|
+
+    Parameters
+    ----------
+    exp: :class:`numpy.ndarray`
+        The skywars experience values. Anything :func:`numpy.asarray`
+        accepts can be passed.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The skywars levels as floats.
+    """
+    np = _numpy()
+    exp = np.asarray(exp, dtype=np.float64)
+    totals = np.array(SKYWARS_TOTALS, dtype=np.float64)
+
+    i = np.searchsorted(totals, exp, side='right').clip(
+        1, len(SKYWARS_TOTALS) - 1
+    )
+    previous = totals[i - 1]
+    early = i + (exp - previous) / (totals[i] - previous)
+    late = (exp - totals[-1]) / SKYWARS_LEVEL_EXP + 12
+    return np.where(exp >= totals[-1], late, early)
+
+
+def uhc_levels(score):
+    """Batch version of :func:`uhc_level`.
+
+    |numpy|
+
+    Parameters
+    ----------
+    score: :class:`numpy.ndarray`
+        The uhc score values. Anything :func:`numpy.asarray` accepts
+        can be passed.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The uhc levels as integers.
+    """
+    np = _numpy()
+    score = np.asarray(score, dtype=np.float64)
+    return np.searchsorted(
+        np.array(UHC_TOTALS, dtype=np.float64), score, side='right'
+    )
@@ -5,11 +5,14 @@ MIT License, see LICENSE for more details.
 
 from dataclasses import dataclass, field
 
+from ..utils import slotted
+
 __all__ = [
     'Bans',
 ]
 
 
+@slotted
 @dataclass
 class Bans:
     raw: dict = field(repr=False)
@@ -12,6 +12,7 @@ from ..color import Color
 from ..game import Game
 
 from . import utils
+from ..utils import slotted
 
 __all__ = [
     'Guild',
@@ -20,6 +21,7 @@ __all__ = [
 ]
 
 
+@slotted
 @dataclass
 class GuildRank:
     name: str
@@ -42,6 +44,7 @@ class GuildRank:
             if self.priority is not None and other.priority is not None:
                 return self.priority < other.priority
 
+@slotted
 @dataclass
 class GuildMember:
     uuid: str
@@ -50,15 +53,33 @@ class GuildMember:
     exp_history: Dict[datetime, int] = field(repr=False)
     quest_participation: int = 0
     name: Optional[str] = None # legacy
+    _exp_history: Optional[Dict[str, int]] = field(
+        init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         self.joined = utils.convert_to_datetime(self.joined)
 
-        self.exp_history = {
+        # Parsed the first time it's accessed, as most members' history
+        # is never read.
+        self._exp_history = self.exp_history
+        del self.exp_history
+
+    def __getattr__(self, name: str):
+        # Only called for attributes that aren't set.
+        if name != 'exp_history':
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        value = {
             datetime.fromisoformat(time).replace(tzinfo=timezone.utc): value
-            for time, value in self.exp_history.items()
+            for time, value in self._exp_history.items()
         }
+        self.exp_history = value
+        self._exp_history = None
+        return value
 
+@slotted
 @dataclass
 class Guild:
     """Guild model object."""
@@ -99,7 +120,12 @@ class Guild:
             GuildRank(**utils._clean(rank, 'GUILD_RANK'))
             for rank in self.ranks
         ]
+        # Members look their rank up by name. The first rank with a
+        # name is used if there are duplicates.
+        ranks = {}
+        for rank in self.ranks:
+            ranks.setdefault(rank.name, rank)
         self.members = [
-            GuildMember(**utils._clean(member, 'GUILD_MEMBER', extra=self.ranks))
+            GuildMember(**utils._clean(member, 'GUILD_MEMBER', extra=ranks))
             for member in self.members
         ]
@@ -5,11 +5,14 @@ MIT License, see LICENSE for more details.
 
 from dataclasses import dataclass, field
 
+from ..utils import slotted
+
 __all__ = [
     'Key',
 ]
 
 
+@slotted
 @dataclass
 class Key:
     raw: dict = field(repr=False)
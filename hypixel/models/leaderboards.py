@@ -6,11 +6,14 @@ MIT License, see LICENSE for more details.
 from dataclasses import dataclass#, field
 from typing import Tuple
 
+from ..utils import slotted
+
 __all__ = [
     'Leaderboard',
 ]
 
 
+@slotted
 @dataclass
 class Leaderboard:
     path: str
@@ -6,6 +6,7 @@ MIT License, see LICENSE for more details.
 from dataclasses import dataclass, field
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'Arcade',
@@ -16,11 +17,13 @@ __all__ = [
 ]
 
 
+@slotted
 @dataclass
 class CaptureTheWool:
     captures: int = 0
     kills_assists: int = 0
 
+@slotted
 @dataclass
 class HypixelSays:
     rounds: int = 0
@@ -33,6 +36,7 @@ class HypixelSays:
         self.losses = self.rounds - self.wins
         self.wlr = utils.safe_div(self.wins, self.losses)
 
+@slotted
 @dataclass
 class MiniWalls:
     kills: int = 0
@@ -48,6 +52,7 @@ class MiniWalls:
     def __post_init__(self):
         self.kdr = utils.safe_div(self.kills, self.deaths)
 
+@slotted
 @dataclass
 class PartyGames:
     wins: int = 0
@@ -59,6 +64,7 @@ class PartyGames:
     def __post_init__(self):
         self.total_wins = self.wins + self.wins_2 + self.wins_3
 
+@slotted
 @dataclass
 class Arcade:
     _data: dict = field(repr=False)
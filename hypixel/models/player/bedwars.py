@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'Bedwars',
@@ -14,6 +15,7 @@ __all__ = [
 ]
 
 
+@slotted
 @dataclass
 class BedwarsMode:
     """Base model for bedwars mode stats.
@@ -84,6 +86,7 @@ class BedwarsMode:
         self.fkdr = utils.safe_div(self.final_kills, self.final_deaths)
         self.bblr = utils.safe_div(self.beds_broken, self.beds_lost)
 
+@slotted
 @dataclass
 class Bedwars:
     """Base model for bedwars stats.
@@ -6,12 +6,14 @@ MIT License, see LICENSE for more details.
 from dataclasses import dataclass, field
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'Blitz',
 ]
 
 
+@slotted
 @dataclass
 class Blitz:
     coins: int = 0
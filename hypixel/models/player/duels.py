@@ -6,6 +6,7 @@ MIT License, see LICENSE for more details.
 from dataclasses import dataclass, field
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'Duels',
@@ -13,6 +14,7 @@ __all__ = [
 ]
 
 
+@slotted
 @dataclass
 class DuelsMode:
     """Base model for duels gamemode stats.
@@ -74,6 +76,7 @@ class DuelsMode:
         )
         self.title = utils.get_title(self._data, self._mode)
 
+@slotted
 @dataclass
 class Duels:
     _data: dict = field(repr=False)
@@ -6,6 +6,7 @@ MIT License, see LICENSE for more details.
 from dataclasses import dataclass, field
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'MurderMystery',
@@ -13,6 +14,7 @@ __all__ = [
 ]
 
 
+@slotted
 @dataclass
 class MurderMysteryMode:
     games: int = 0
@@ -28,6 +30,7 @@ class MurderMysteryMode:
     def __post_init__(self):
         self.kdr = utils.safe_div(self.kills, self.deaths)
 
+@slotted
 @dataclass
 class MurderMystery:
     _data: dict = field(repr=False)
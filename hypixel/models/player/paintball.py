@@ -6,12 +6,14 @@ MIT License, see LICENSE for more details.
 from dataclasses import dataclass, field
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'Paintball',
 ]
 
 
+@slotted
 @dataclass
 class Paintball:
     coins: int = 0
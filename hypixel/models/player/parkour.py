@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'Parkour',
@@ -14,6 +15,7 @@ __all__ = [
 ]
 
 
+@slotted
 @dataclass
 class ParkourLobby:
     completed: datetime
@@ -25,6 +27,7 @@ class ParkourLobby:
             self.completed
         ) + self.time
 
+@slotted
 @dataclass
 class Parkour:
     _data: dict = field(repr=False)
@@ -43,24 +46,25 @@ class Parkour:
     uhc: ParkourLobby = field(init=False)
     warlords: ParkourLobby = field(init=False)
 
+    # Not a field, so it's shared by every instance.
+    _modes = (
+        'arcade',
+        'bedwars',
+        'blitz',
+        'build_battle',
+        'cops_and_crims',
+        'duels',
+        'main',
+        'mega_walls',
+        'murder_mystery',
+        'skywars',
+        'smash',
+        'tnt',
+        'uhc',
+        'warlords',
+    )
+
     def __post_init__(self):
-        self._modes = [
-            'arcade',
-            'bedwars',
-            'blitz',
-            'build_battle',
-            'cops_and_crims',
-            'duels',
-            'main',
-            'mega_walls',
-            'murder_mystery',
-            'skywars',
-            'smash',
-            'tnt',
-            'uhc',
-            'warlords',
-        ]
-        self._len = len(self._modes)
         for mode in self._modes:
             data = self._data.get(mode)
             if data:
@@ -70,24 +74,15 @@ class Parkour:
             setattr(self, mode, None)
 
     def __iter__(self):
-        self._i = 0
-        return self
-
-    def __next__(self):
-        if self._i < self._len:
-            result = getattr(self, self._modes[self._i])
-            self._i += 1
-            return result
-        else:
-            raise StopIteration
+        return (getattr(self, mode) for mode in self._modes)
 
     def __getitem__(self, index):
         if not isinstance(index, int):
             raise TypeError('indices must be integers')
-        if index < self._len:
+        if index < len(self._modes):
             return getattr(self, self._modes[index])
         else:
             raise IndexError('index out of range')
 
     def __len__(self):
-        return self._len
+        return len(self._modes)
@@ -26,12 +26,31 @@ from .uhc import Uhc
 from .wool_games import WoolGames
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'Player',
 ]
 
-
+# Game models are built from these the first time they're accessed.
+MODES = {
+    'arcade': Arcade,
+    'bedwars': Bedwars,
+    'blitz': Blitz,
+    'duels': Duels,
+    'murder_mystery': MurderMystery,
+    'paintball': Paintball,
+    'parkour': Parkour,
+    'skywars': Skywars,
+    'socials': Socials,
+    'tkr': TurboKartRacers,
+    'tnt_games': TntGames,
+    'uhc': Uhc,
+    'wool_games': WoolGames,
+}
+
+
+@slotted
 @dataclass
 class Player:
     """Player model object.
@@ -43,8 +62,10 @@ class Player:
 
     Attributes
     ----------
-    raw: :class:`dict`
-        The raw json response returned from the API.
+    raw: Optional[Union[:class:`dict`, :class:`bytes`]]
+        The raw json response returned from the API. Refer to the
+        client's ``keep_raw`` option for when this is ``None`` or
+        compressed.
     id: :class:`str`
         Hypixel's unique identifier.
     uuid: :class:`str`
@@ -134,6 +155,11 @@ class Player:
         A model for abstracting uhc data.
     wool_games: :class:`~hypixel.models.player.WoolGames`
         A model for abstracting wool games data.
+
+    .. note::
+
+        Game models are built the first time they're accessed, so only
+        the ones you use cost any time.
     """
     _data: dict = field(repr=False)
     raw: dict = field(repr=False)
@@ -177,9 +203,10 @@ class Player:
         self.network_exp = int(self.network_exp)
 
         # Some achievement items can be blank, non-string objects.
-        for achievement in self.achievements:
-            if not isinstance(achievement, str):
-                self.achievements.remove(achievement)
+        self.achievements = [
+            achievement for achievement in self.achievements
+            if isinstance(achievement, str)
+        ]
 
         self.level = utils.get_network_level(self.network_exp)
         self.rank = utils.get_rank(self.raw)
@@ -188,24 +215,22 @@ class Player:
         )
         self.plus_color = Color.from_type(self._data.get('rankPlusColor'))
 
-        modes = {
-            'arcade': Arcade,
-            'bedwars': Bedwars,
-            'blitz': Blitz,
-            'duels': Duels,
-            'murder_mystery': MurderMystery,
-            'paintball': Paintball,
-            'parkour': Parkour,
-            'skywars': Skywars,
-            'socials': Socials,
-            'tkr': TurboKartRacers,
-            'tnt_games': TntGames,
-            'uhc': Uhc,
-            'wool_games': WoolGames,
-        }
-        for mode, model in modes.items():
-            data = utils._clean(self._data, mode=mode.upper())
-            setattr(self, mode, model(**data))
+    def _build_all(self):
+        for mode in MODES:
+            getattr(self, mode)
+
+    def __getattr__(self, name: str):
+        # Only called for attributes that aren't set, which game models
+        # aren't until they're built here.
+        model = MODES.get(name)
+        if model is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        data = utils._clean(self._data, mode=name.upper())
+        value = model(**data)
+        setattr(self, name, value)
+        return value
 
     def build_achievements(self):
         """Converts the achievements in :attr:`achievements` to
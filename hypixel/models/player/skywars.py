@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'Skywars',
@@ -14,6 +15,7 @@ __all__ = [
 ]
 
 
+@slotted
 @dataclass
 class SkywarsMode:
     kills: int = 0
@@ -27,6 +29,7 @@ class SkywarsMode:
         self.kdr = utils.safe_div(self.kills, self.deaths)
         self.wlr = utils.safe_div(self.wins, self.losses)
 
+@slotted
 @dataclass
 class Skywars:
     _data: dict = field(repr=False)
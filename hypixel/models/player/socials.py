@@ -6,11 +6,14 @@ MIT License, see LICENSE for more details.
 from dataclasses import dataclass
 from typing import Optional
 
+from ...utils import slotted
+
 __all__ = [
     'Socials',
 ]
 
 
+@slotted
 @dataclass
 class Socials:
     discord: Optional[str] = None
@@ -6,12 +6,14 @@ MIT License, see LICENSE for more details.
 from dataclasses import dataclass, field
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'TurboKartRacers',
 ]
 
 
+@slotted
 @dataclass
 class TurboKartRacers:
     coins: int = 0
@@ -5,6 +5,8 @@ MIT License, see LICENSE for more details.
 
 from dataclasses import dataclass#, field
 
+from ...utils import slotted
+
 # from . import utils
 
 __all__ = [
@@ -12,6 +14,7 @@ __all__ = [
 ]
 
 
+@slotted
 @dataclass
 class TntGames:
     coins: int = 0
@@ -6,6 +6,7 @@ MIT License, see LICENSE for more details.
 from dataclasses import dataclass, field
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'Uhc',
@@ -13,6 +14,7 @@ __all__ = [
 ]
 
 
+@slotted
 @dataclass
 class UhcMode:
     wins: int = 0
@@ -25,6 +27,7 @@ class UhcMode:
     def __post_init__(self):
         self.kdr = utils.safe_div(self.kills, self.deaths)
 
+@slotted
 @dataclass
 class Uhc:
     _data: dict = field(repr=False)
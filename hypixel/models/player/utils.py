@@ -5,104 +5,116 @@ MIT License, see LICENSE for more details.
 
 from datetime import datetime, timezone
 
+from . import aliases
 from .aliases import *
+from ...levels import (
+    network_level as get_network_level,
+    skywars_level,
+    uhc_level,
+    wool_wars_level as get_wool_wars_level,
+)
+
+
+def _stats(game: str):
+    def select(data: dict):
+        return data.get('stats', {}).get(game, {}), {}
+    return select
+
+# Models get the response's dictionaries as their data, not copies.
+# Nothing modifies them, so they are shared by every model and the
+# response.
+
+def _stats_with_player(game: str):
+    # Arcade models need the whole player document.
+    def select(data: dict):
+        return data.get('stats', {}).get(game, {}), {'_data': data}
+    return select
+
+def _stats_with_data(game: str):
+    # Models whose modes are built from the game's stats.
+    def select(data: dict):
+        data = data.get('stats', {}).get(game, {})
+        return data, {'_data': data}
+    return select
+
+def _select_bedwars(data: dict):
+    level = data.get('achievements', {}).get('bedwars_level', 1)
+    data = data.get('stats', {}).get('Bedwars', {})
+    return data, {'_data': data, 'bedwars_level': level}
+
+def _select_wool_games(data: dict):
+    data = data.get('stats', {}).get('WoolGames', {})
+    experience = round(data.get('progression', {}).get('experience', 0))
+    return data, {'_data': data, 'experience': experience}
+
+def _select_wool_wars(data: dict):
+    wool_wars = data.get('wool_wars', {})
+    selected_class = wool_wars.get('selected_class')
+    return wool_wars.get('stats', {}), {'selected_class': selected_class}
+
+def _select_removed(data: dict):
+    return data, {'removed': True}
+
+# Mode -> function that returns the dictionary to look up the mode's
+# aliases in, and values to add that aren't in it (by their unaliased
+# keys). Other modes look up their aliases in the passed dictionary.
+SELECTORS = {
+    'ARCADE': _stats_with_player('Arcade'),
+    'BEDWARS': _select_bedwars,
+    'BLITZ': _stats('HungerGames'),
+    'CTW': lambda data: (data.get('achievements', {}), {}),
+    'DUELS': _stats_with_data('Duels'),
+    'HYPIXEL_SAYS': _stats_with_player('Arcade'),
+    'MINI_WALLS': _stats_with_player('Arcade'),
+    'MM_HARDCORE': _select_removed,
+    'MM_SHOWDOWN': _select_removed,
+    'MURDER_MYSTERY': _stats_with_data('MurderMystery'),
+    'PAINTBALL': _stats('Paintball'),
+    'PARTY_GAMES': _stats_with_player('Arcade'),
+    'SKYWARS': _stats_with_data('SkyWars'),
+    'SOCIALS': lambda data: (
+        data.get('socialMedia', {}).get('links', {}), {}
+    ),
+    'TKR': _stats('GingerBread'),
+    'TNT_GAMES': _stats('TNTGames'),
+    'UHC': _stats_with_data('UHC'),
+    'WOOL_GAMES': _select_wool_games,
+    'WOOL_GAMES_WOOL_WARS': _select_wool_wars,
+}
 
+def _compile(alias: dict, select=None):
+    # Iterating the aliases instead of the data skips the hundreds of
+    # stats keys no model uses.
+    pairs = tuple(alias.items())
+
+    if select is None:
+        def extract(data: dict) -> dict:
+            return {new: data[old] for old, new in pairs if old in data}
+        return extract
+
+    def extract(data: dict) -> dict:
+        data, extra = select(data)
+        result = {new: data[old] for old, new in pairs if old in data}
+        for key, value in extra.items():
+            if key in alias:
+                result[alias[key]] = value
+        return result
+    return extract
+
+# Mode -> function that returns the model's keyword arguments.
+EXTRACTORS = {
+    mode: _compile(getattr(aliases, mode), SELECTORS.get(mode))
+    for mode in aliases.__all__
+}
+
+_extract_parkour = EXTRACTORS['PARKOUR']
+# Parkour keeps the aliased completions as its data.
+EXTRACTORS['PARKOUR'] = lambda data: {
+    '_data': _extract_parkour(data.get('parkourCompletions', {}))
+}
 
-REQUIRE_COPY = [
-    'ARCADE',
-    'HYPIXEL_SAYS',
-    'MINI_WALLS',
-    'PARTY_GAMES',
-]
 def _clean(data: dict, mode: str) -> dict:
-    alias = globals()[mode]
-
-    if mode in REQUIRE_COPY:
-        _data = data.copy()
-
-    if mode == 'ARCADE':
-        data = data.get('stats', {}).get('Arcade', {})
-
-    elif mode == 'SOCIALS':
-        data = data.get('socialMedia', {}).get('links', {})
-
-    elif mode in ('HYPIXEL_SAYS', 'MINI_WALLS', 'PARTY_GAMES'):
-        data = data.get('stats', {}).get('Arcade', {})
-
-    elif mode == 'TKR':
-        data = data.get('stats', {}).get('GingerBread', {})
-
-    elif mode == 'MURDER_MYSTERY':
-        data = data.get('stats', {}).get('MurderMystery', {})
-        data['_data'] = data.copy()
-
-    elif mode == 'UHC':
-        data = data.get('stats', {}).get('UHC', {})
-        data['_data'] = data.copy()
-
-    elif mode == 'BEDWARS':
-        level = data.get('achievement_stats', {}).get('bedwars_level', 1)
-        data = data.get('stats', {}).get('Bedwars', {})
-        data['bedwars_level'] = level
-        # Copy here instead of before and after because BedwarsMode
-        # classes need stats.Bedwars specific data.
-        data['_data'] = data.copy()
-
-    elif mode == 'SKYWARS':
-        data = data.get('stats', {}).get('SkyWars', {})
-        # Copy here instead of before and after because SkywarsMode
-        # classes need stats.SkyWars specific data.
-        data['_data'] = data.copy()
-
-    elif mode == 'DUELS':
-        data = data.get('stats', {}).get('Duels', {})
-        # Copy here instead of before and after because DuelsMode
-        # classes need stats.Duels specific data.
-        data['_data'] = data.copy()
-
-    elif mode == 'PAINTBALL':
-        data = data.get('stats', {}).get('Paintball', {})
-
-    elif mode == 'PARKOUR':
-        # Return here because _data is used after aliases are converted
-        data = data.get('parkourCompletions', {})
-        replaced_data = {alias.get(k, k): v for k, v in data.items()}
-        data = {
-            key: replaced_data[key]
-            for key in replaced_data if key in alias.values()
-        }
-        return {'_data': data}
-
-    elif mode == 'BLITZ':
-        data = data.get('stats', {}).get('HungerGames', {})
-
-    elif mode == 'TNT_GAMES':
-        data = data.get('stats', {}).get('TNTGames', {})
-
-    elif mode == 'CTW':
-        data = data.get('achievement_stats', {})
-
-    elif mode in ('MM_HARDCORE', 'MM_SHOWDOWN'):
-        data['removed'] = True
-
-    elif mode == 'WOOL_GAMES':
-        data = data.get('stats', {}).get('WoolGames', {})
-        data['experience'] = round(data.get('progression', {}).get('experience', 0))
-        # Copy here instead of before and after because WoolGamesMode
-        # classes need stats.WoolGames specific data.
-        data['_data'] = data.copy()
-
-    elif mode == 'WOOL_GAMES_WOOL_WARS':
-        selected_class = data.get('wool_wars', {}).get('selected_class')
-        data = data.get('wool_wars', {}).get('stats', {})
-        data['selected_class'] = selected_class
-
-    if mode in REQUIRE_COPY:
-        data['_data'] = _data
-
-    # Replace keys in data with formatted alias
-    # Remove items that are not in the alias dictionary
-    return {alias.get(k, k): v for k, v in data.items() if k in alias.keys()}
+    return EXTRACTORS[mode](data)
 
 def convert_to_datetime(decimal: int) -> datetime:
     # Float division is cheaper than integer division.
@@ -112,35 +124,6 @@ def convert_to_datetime(decimal: int) -> datetime:
     dt = datetime.fromtimestamp(seconds, tz=timezone.utc)
     return dt
 
-def get_network_level(network_exp: int) -> float:
-    return round(1 + (-8750.0 + (8750 ** 2 + 5000 * network_exp) ** 0.5) / 2500, 2)
-
-# Same calculation as bedwars experience to bedwars level
-def get_wool_wars_level(exp: int) -> float:
-    levels = (exp // 487000) * 100
-    exp %= 487000
-
-    costs = {1: 500, 2: 1000, 3: 2000, 4: 3500}
-    for i in range(1, 5):
-        cost = costs[i]
-        if exp >= cost:
-            levels += 1
-            exp -= cost
-        else:
-            break
-
-    levels += exp // 5000
-    exp %= 5000
-
-    next_level = (levels + 1) % 100
-
-    if next_level in costs:
-        next_level_cost = costs[next_level]
-    else:
-        next_level_cost = 5000
-
-    return round(levels + exp / next_level_cost, 2)
-
 def safe_div(a: int, b: int) -> float:
     if not b:
         return float(a)
@@ -225,30 +208,3 @@ def get_rank(raw):
     else:
         return None
     return display_rank.replace('_', '').replace('PLUS', '+')
-
-
-"""
-MIT License
-
-Copyright (c) 2018 The Slothpixel Project
-"""
-
-# Length 12
-xps_s = (0, 20, 70, 150, 250, 500, 1000, 2000, 3500, 6000, 10000, 15000)
-def skywars_level(exp) -> float:
-    if exp >= 15000:
-        return (exp - 15000) / 10000 + 12
-    for i in range(12):
-        if exp < xps_s[i]:
-            return i + (exp - xps_s[i - 1]) / (xps_s[i] - xps_s[i - 1])
-
-xps_u = (0, 10, 60, 210, 460, 960, 1710, 2710, 5210, 10210, 13210, 16210,
-       19210, 22210, 25210)
-def uhc_level(exp):
-    level = 0
-    for xp in xps_u:
-        if exp >= xp:
-            level += 1
-        else:
-            break
-    return level
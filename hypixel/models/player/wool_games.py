@@ -6,6 +6,7 @@ MIT License, see LICENSE for more details.
 from dataclasses import dataclass, field
 
 from . import utils
+from ...utils import slotted
 
 __all__ = [
     'WoolGames',
@@ -13,6 +14,7 @@ __all__ = [
 ]
 
 
+@slotted
 @dataclass
 class WoolGamesMode:
     kills: int = 0
@@ -33,6 +35,7 @@ class WoolGamesMode:
         self.kdr = utils.safe_div(self.kills, self.deaths)
         self.wlr = utils.safe_div(self.wins, self.losses)
 
+@slotted
 @dataclass
 class WoolGames:
     _data: dict = field(repr=False)
@@ -7,12 +7,14 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 from ..game import Game
+from ..utils import slotted
 
 __all__ = [
     'Status',
 ]
 
 
+@slotted
 @dataclass
 class Status:
     raw: dict = field(repr=False)
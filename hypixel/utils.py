@@ -4,11 +4,15 @@ MIT License, see LICENSE for more details.
 """
 
 import asyncio
+import dataclasses
 import functools
+import json
 import random
 from string import Formatter
 import time
+from typing import Optional
 from uuid import UUID
+import zlib
 
 from .aliases import *
 from .errors import InvalidPlayerId, TimeoutError
@@ -17,6 +21,7 @@ from .game import Game
 __all__ = [
     'ExponentialBackoff',
     'HashedDict',
+    'RateLimiter',
     'strfdelta',
 ]
 
@@ -24,65 +29,339 @@ __all__ = [
 def _clean(data: dict, mode: str) -> dict:
     alias = globals()[mode]
 
-    if mode == 'PLAYER':
-        # Avoid name conflicts
-        data['achievement_stats'] = data.pop('achievements', {})
+    # Replace keys in data with formatted alias
+    # Remove items that are not in the alias dictionary
+    cleaned = {new: data[old] for old, new in alias.items() if old in data}
+
+    # The response isn't modified, so it can be cached and reused.
 
     # Deprecated by Hypixel
-    # elif mode == 'FRIEND':
+    # if mode == 'FRIEND':
     #     # Sender and receiver could be either the player or the friend
     #     # as the api stores the sender and receiver of the actual friend
     #     # request.
     #     # Extra is the player's uuid.
     #     if data['uuidReceiver'] == extra:
-    #         data['uuidReceiver'] = data['uuidSender']
+    #         cleaned['uuid_receiver'] = data['uuidSender']
 
-    elif mode == 'STATUS':
-        data['gameType'] = Game.from_type(data.get('gameType'))
+    if mode == 'STATUS':
+        cleaned['game'] = Game.from_type(data.get('gameType'))
 
     elif mode == 'GUILD':
         achievements = data.get('achievements', {})
-        data['winners'] = achievements.get('WINNERS')
-        data['experience_kings'] = achievements.get('EXPERIENCE_KINGS')
-        data['most_online_players'] = achievements.get('ONLINE_PLAYERS')
+        cleaned['winners'] = achievements.get('WINNERS')
+        cleaned['experience_kings'] = achievements.get('EXPERIENCE_KINGS')
+        cleaned['most_online_players'] = achievements.get('ONLINE_PLAYERS')
+
+    return cleaned
+
+# Cached errors are stored as dictionaries with this key so they stay
+# JSON serializable.
+ERROR_KEY = '__error__'
+# Entries cached with a stale max age are stored as dictionaries with
+# the time they were fetched at under this key.
+STALE_KEY = '__fetched__'
+
+def _dump_error(error: Exception) -> dict:
+    attrs = {
+        k: v for k, v in vars(error).items()
+        if isinstance(v, (str, int, float, bool, type(None)))
+    }
+    return {
+        ERROR_KEY: type(error).__name__,
+        'args': list(error.args),
+        'attrs': attrs,
+    }
 
-    # Replace keys in data with formatted alias
-    # Remove items that are not in the alias dictionary
-    return {alias.get(k, k): v for k, v in data.items() if k in alias.keys()}
+def _load_error(value: dict, error_types: dict) -> Optional[Exception]:
+    cls = error_types.get(value[ERROR_KEY])
+    if cls is None:
+        return None
+    error = cls.__new__(cls)
+    error.args = tuple(value['args'])
+    error.__dict__.update(value['attrs'])
+    return error
+
+def async_cache(
+    function,
+    backend,
+    max_age: int,
+    *,
+    negative_max_age: Optional[int] = None,
+    negative=None,
+    errors: Optional[dict] = None,
+    stale_max_age: Optional[float] = None,
+    uncached: tuple = (),
+):
+    """Cache decorator for async functions that stores results in a
+    :class:`~hypixel.CacheBackend`.
+
+    Only returned values are cached, so a raised error isn't replayed to
+    later calls, unless ``errors`` maps its exact type to the amount of
+    time (in seconds) it's cached for. Arguments have to be JSON
+    serializable because they make up the key.
+
+    Negative values, which ``negative`` returns ``True`` for, are cached
+    for ``negative_max_age`` instead, or not at all if it's ``None``.
+
+    If ``stale_max_age`` is passed, values older than ``max_age`` are
+    still returned until they're ``stale_max_age`` old, and refreshed in
+    a background task. Only one refresh runs per key at a time.
+
+    Calls passing a keyword argument named in ``uncached`` (that isn't
+    ``None``) skip the cache, so secrets like API keys are never stored
+    in a backend.
+    """
+    errors = errors or {}
+    error_types = {error.__name__: error for error in errors}
+    # Key -> background refresh task.
+    refreshes = {}
 
-def async_timed_cache(function, max_age: int, max_size: int, typed=False):
-    """Lru cache decorator with time-based cache invalidation and async
-    implementation."""
-    # _time_hash forces functools to provide a ttl.
-    @functools.lru_cache(maxsize=max_size, typed=typed)
-    def _new_timed(*args, _time_hash, **kwargs):
-        return asyncio.ensure_future(function(*args, **kwargs))
+    async def _fetch(key, args, kwargs):
+        try:
+            value = await function(*args, **kwargs)
+        except tuple(errors) as error:
+            ttl = errors.get(type(error))
+            if ttl is not None:
+                await backend.set(key, _dump_error(error), ttl)
+            raise
+
+        if negative is not None and negative(value):
+            if negative_max_age is not None:
+                await backend.set(key, value, negative_max_age)
+        elif stale_max_age is not None:
+            # Wall time so the age is correct in persistent backends.
+            entry = {STALE_KEY: time.time(), 'value': value}
+            await backend.set(key, entry, stale_max_age)
+        else:
+            await backend.set(key, value, max_age)
+        return value
 
-    @functools.lru_cache(maxsize=max_size, typed=typed)
-    def _new(*args, **kwargs):
-        return asyncio.ensure_future(function(*args, **kwargs))
+    async def _refresh(key, args, kwargs):
+        try:
+            await _fetch(key, args, kwargs)
+        except Exception:
+            # The stale value is served until it expires.
+            pass
+
+    def _schedule_refresh(key, args, kwargs):
+        if key in refreshes:
+            return
+        task = asyncio.ensure_future(_refresh(key, args, kwargs))
+        refreshes[key] = task
+        task.add_done_callback(lambda _: refreshes.pop(key, None))
 
     @functools.wraps(function)
-    def _wrapped(*args, **kwargs):
-        if max_age <= 0:
-            return _new(*args, **kwargs)
-        salt = int(time.monotonic() / max_age)
-        return _new_timed(*args, **kwargs, _time_hash=salt)
-
-    if max_age <= 0:
-        _wrapped.cache_info = _new.cache_info
-        _wrapped.clear_cache = _new.cache_clear
-    else:
-        _wrapped.cache_info = _new_timed.cache_info
-        _wrapped.clear_cache = _new_timed.cache_clear
+    async def _wrapped(*args, **kwargs):
+        if any(kwargs.get(name) is not None for name in uncached):
+            return await function(*args, **kwargs)
+        # The function name keeps keys apart when functions share a
+        # backend.
+        key = json.dumps(
+            [function.__name__, args, kwargs],
+            sort_keys=True,
+        )
+        value = await backend.get(key)
+        if isinstance(value, dict) and ERROR_KEY in value:
+            error = _load_error(value, error_types)
+            if error is not None:
+                raise error
+        elif isinstance(value, dict) and STALE_KEY in value:
+            if time.time() - value[STALE_KEY] >= max_age:
+                _schedule_refresh(key, args, kwargs)
+            return value['value']
+        elif value is not None:
+            return value
+
+        return await _fetch(key, args, kwargs)
+
+    def _cancel_refreshes():
+        for task in list(refreshes.values()):
+            task.cancel()
+
+    _wrapped.cache_info = backend.stats
+    _wrapped.clear_cache = backend.clear
+    _wrapped.cancel_refreshes = _cancel_refreshes
 
     return _wrapped
 
+def single_flight(function):
+    """Coalesces concurrent calls to an async function with the same
+    arguments into one call whose result is shared by every caller.
+
+    A cancelled caller doesn't cancel the shared call unless it was the
+    last caller waiting for it.
+    """
+    calls = {}
+
+    @functools.wraps(function)
+    async def _wrapped(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        call = calls.get(key)
+        if call is None:
+            # [task, waiters]
+            call = [asyncio.ensure_future(function(*args, **kwargs)), 0]
+            calls[key] = call
+
+            def _done(_):
+                if calls.get(key) is call:
+                    del calls[key]
+
+            call[0].add_done_callback(_done)
+
+        call[1] += 1
+        try:
+            # Shielded so one caller being cancelled doesn't cancel the
+            # call for the others.
+            return await asyncio.shield(call[0])
+        finally:
+            call[1] -= 1
+            if not call[1] and not call[0].done():
+                # Removed first so callers arriving before the task
+                # finishes cancelling start a new call instead of
+                # joining the cancelled one.
+                if calls.get(key) is call:
+                    del calls[key]
+                call[0].cancel()
+
+    return _wrapped
+
+class Batcher:
+    """Collects keys submitted within a short window and resolves them
+    together with a single call.
+
+    ``function`` is awaited with a list of at most ``max_size`` keys and
+    has to return a dictionary mapping every key to either its result or
+    an exception to raise for it. If ``function`` raises, the exception
+    is raised for every key of the batch.
+    """
+
+    def __init__(self, function, *, delay: float, max_size: int):
+        self._function = function
+        self._delay = delay
+        self._max_size = max_size
+        # Key -> list of futures waiting for it
+        self._pending = {}
+        self._handle = None
+        # Strong references so running batches aren't garbage collected.
+        self._tasks = set()
+
+    def submit(self, key) -> asyncio.Future:
+        """Adds a key to the next batch and returns a future for its
+        result."""
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._handle is None:
+            self._handle = loop.call_later(self._delay, self._flush)
+        return future
+
+    def _flush(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        pending, self._pending = self._pending, {}
+        keys = list(pending)
+        for i in range(0, len(keys), self._max_size):
+            batch = {key: pending[key] for key in keys[i:i + self._max_size]}
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        try:
+            results = await self._function(list(batch))
+        except asyncio.CancelledError:
+            for futures in batch.values():
+                for future in futures:
+                    future.cancel()
+            raise
+        except Exception as error:
+            results = dict.fromkeys(batch, error)
+
+        for key, futures in batch.items():
+            result = results[key]
+            for future in futures:
+                # The caller could have been cancelled.
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
 class HashedDict(dict):
     def __hash__(self):
         fs = frozenset(self.items())
         return hash(fs)
 
+# Same as dataclass(slots=True), which requires Python 3.10.
+def slotted(cls):
+    """Class decorator that recreates a dataclass with ``__slots__`` for
+    its fields, so instances don't have a ``__dict__``.
+
+    Must be applied on top of ``@dataclass``. The dataclass methods are
+    kept, so attributes and equality are unchanged.
+    """
+    fields = dataclasses.fields(cls)
+    names = tuple(field.name for field in fields)
+    cls_dict = dict(cls.__dict__)
+    cls_dict['__slots__'] = names
+    # Defaults are class attributes, which would conflict with the
+    # slots. The generated __init__ has its own reference to them,
+    # except for fields that aren't arguments.
+    for name in names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+
+    defaults = {
+        field.name: field.default for field in fields
+        if not field.init and field.default is not dataclasses.MISSING
+    }
+    if defaults:
+        init = cls.__init__
+
+        @functools.wraps(init)
+        def __init__(self, *args, **kwargs):
+            for name, value in defaults.items():
+                # Works for frozen dataclasses too.
+                object.__setattr__(self, name, value)
+            init(self, *args, **kwargs)
+
+        cls_dict['__init__'] = __init__
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+def _drop_data(model) -> None:
+    # Removes the data models were built from, recursively.
+    for field in dataclasses.fields(model):
+        value = getattr(model, field.name, None)
+        if field.name == '_data':
+            setattr(model, field.name, None)
+        elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+            _drop_data(value)
+
+def _apply_keep_raw(model, keep_raw):
+    """Drops or compacts the raw response of a model according to the
+    ``keep_raw`` client option."""
+    if keep_raw is True:
+        return model
+    build = getattr(model, '_build_all', None)
+    if build is not None:
+        # Lazy attributes need the data that's about to be dropped.
+        build()
+    _drop_data(model)
+    if keep_raw == 'compact':
+        model.raw = zlib.compress(json.dumps(model.raw).encode())
+    else:
+        model.raw = None
+    return model
+
 # For asynchronous instance methods whose first non-self parameter is a
 # player id (string of uuid or username).
 def convert_id(function):
@@ -224,3 +503,102 @@ class ExponentialBackoff:
 
         self._exp = min(self._exp + 1, self._max)
         return self._randfunc(0, self._base * 2**self._exp)
+
+
+class RateLimiter:
+    """Paces requests using the ``RateLimit-*`` headers returned by the
+    Hypixel API.
+
+    Every response updates the known quota with :meth:`update`. Once the
+    quota of the current window is used up, :meth:`acquire` waits until
+    the window resets instead of letting requests fail with a 429
+    status.
+
+    Attributes
+    ----------
+    limit: Optional[:class:`int`]
+        The amount of requests allowed per window, or ``None`` if no
+        response has been received yet.
+    remaining: Optional[:class:`int`]
+        The amount of requests left in the current window, or ``None``
+        if no response has been received yet. Requests that are still
+        in flight are already subtracted.
+    """
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        # Monotonic time the current window resets at, None if unknown.
+        self._reset: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        """Waits until a request can be made without exceeding the rate
+        limit and reserves it.
+
+        Parameters
+        ----------
+        timeout: Optional[:class:`float`]
+            The maximum amount of time (in seconds) to wait.
+
+        Raises
+        ------
+        :exc:`TimeoutError`
+            Raised when the window resets later than ``timeout``.
+        """
+        # Created lazily so it's bound to the running loop.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            if self._reset is not None and self._reset <= now:
+                self._refill()
+            if (
+                self.remaining is not None
+                and self.remaining <= 0
+                and self._reset is not None
+            ):
+                delay = self._reset - now
+                if timeout is not None and delay > timeout:
+                    raise TimeoutError('hypixel')
+                await asyncio.sleep(delay)
+                self._refill()
+            if self.remaining is not None:
+                self.remaining -= 1
+
+    def update(self, headers) -> None:
+        """Updates the quota from the headers of a response.
+
+        Responses without rate limit headers are ignored.
+
+        Parameters
+        ----------
+        headers: Mapping[:class:`str`, :class:`str`]
+            The response headers.
+        """
+        try:
+            limit = int(headers['RateLimit-Limit'])
+            remaining = int(headers['RateLimit-Remaining'])
+            reset = time.monotonic() + int(headers['RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return
+
+        self.limit = limit
+        # The reset header only has second precision, so the same
+        # window can be off by up to a second between responses.
+        if (
+            self._reset is None
+            or self.remaining is None
+            or reset > self._reset + 1
+        ):
+            self.remaining = remaining
+        else:
+            # Responses can arrive out of order, so never give back
+            # quota within the same window.
+            self.remaining = min(self.remaining, remaining)
+        self._reset = reset
+
+    def _refill(self):
+        self.remaining = self.limit
+        # Unknown until the next response.
+        self._reset = None
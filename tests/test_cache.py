@@ -0,0 +1,422 @@
+"""Tests for hypixel.cache and Client caching."""
+
+import asyncio
+import os
+
+from aioresponses import aioresponses
+import hypixel
+from hypixel import CacheInfo
+from hypixel import DiskCache
+from hypixel import IdentityStore
+from hypixel import MemoryCache
+from hypixel import SQLiteCache
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_memory_cache():
+    cache = MemoryCache(max_size=2)
+    await cache.set('a', 1, None)
+    await cache.set('b', 2, 60)
+    assert await cache.get('a') == 1
+    # 'b' is the least recently used.
+    await cache.set('c', 3, 60)
+    assert await cache.get('b') is None
+    assert await cache.get('c') == 3
+    assert cache.stats() == CacheInfo(2, 1, 2, 2)
+
+    await cache.delete('a')
+    assert await cache.get('a') is None
+
+    cache.clear()
+    assert cache.stats() == CacheInfo(0, 0, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_expiry():
+    cache = MemoryCache()
+    await cache.set('a', 1, 0.01)
+    await cache.set('b', 2, None)
+    await asyncio.sleep(0.02)
+    # Expired entries don't count towards the size.
+    assert cache.stats().currsize == 1
+    assert await cache.get('a') is None
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_sweeper():
+    cache = MemoryCache(sweep_interval=0.01)
+    await cache.set('a', 1, 0.01)
+    # Replaced entries aren't removed by their old expiry.
+    await cache.set('b', 2, 0.01)
+    await cache.set('b', 2, 60)
+    await asyncio.sleep(0.05)
+    assert list(cache._data) == ['b']
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_expiries_bounded():
+    cache = MemoryCache(max_size=10)
+    for i in range(1000):
+        await cache.set('a', i, 60)
+    assert len(cache._expiries) <= 2
+    for i in range(1000):
+        await cache.set(i, i, 60)
+    assert len(cache._data) == 10
+    assert len(cache._expiries) <= 20
+    assert await cache.get(999) == 999
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = SQLiteCache(path, max_size=2)
+    await cache.set('a', {'player': {'uuid': 'abc'}}, None)
+    await cache.set('b', 'b', 60)
+    assert await cache.get('a') == {'player': {'uuid': 'abc'}}
+    await cache.set('c', 'c', 60)
+    assert await cache.get('b') is None
+    assert cache.stats().currsize == 2
+    cache.close()
+
+    # Entries persist between connections.
+    cache = SQLiteCache(path)
+    assert await cache.get('a') == {'player': {'uuid': 'abc'}}
+    await cache.delete('a')
+    assert await cache.get('a') is None
+    cache.clear()
+    assert cache.stats().currsize == 0
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_cache(tmp_path, utils):
+    path = str(tmp_path / 'cache')
+    player = utils.response('player')
+    # Every file is large enough to be memory mapped.
+    cache = DiskCache(path, max_size=2, mmap_size=0)
+    await cache.set('a', player, None)
+    await cache.set('b', 'b', 60)
+    assert await cache.get('a') == player
+    # 'b' is the least recently used.
+    await cache.set('c', 'c', 60)
+    assert await cache.get('b') is None
+    assert cache.stats() == CacheInfo(1, 1, 2, 2)
+
+    # Entries are restored with their original expiry.
+    cache.max_size = None
+    await cache.set('b', 'b', 0.01)
+    await asyncio.sleep(0.02)
+    cache = DiskCache(path)
+    assert cache.stats().currsize == 2
+    assert await cache.get('a') == player
+    assert await cache.get('b') is None
+    await cache.delete('a')
+    assert await cache.get('a') is None
+
+    # A lower max_age applies to entries written with a longer TTL.
+    await cache.set('c', 'c', 60)
+    await asyncio.sleep(0.02)
+    cache = DiskCache(path, max_age=0.01)
+    assert cache.stats().currsize == 0
+    assert await cache.get('c') is None
+    await cache.set('c', 'c', 60)
+    assert await cache.get('c') == 'c'
+    await asyncio.sleep(0.02)
+    assert await cache.get('c') is None
+
+    # Corrupt entries are misses.
+    await cache.set('d', 'd', None)
+    with open(os.path.join(path, cache._filename('d')), 'r+b') as file:
+        file.seek(DiskCache._header.size)
+        file.write(b'corrupt')
+        file.truncate()
+    assert await cache.get('d') is None
+    cache.clear()
+    assert cache.stats().currsize == 0
+
+
+@pytest.mark.asyncio
+async def test_client_cache(key, utils):
+    name = 'duhby'
+    uuid = 'b423f64699f94694ad2366aa9647c606'
+    backend = SQLiteCache(':memory:')
+    client = hypixel.Client(key, cache=True, cache_backend_h=backend)
+    async with client:
+        with aioresponses() as m:
+            # Not repeated, so only the first calls make requests.
+            m.get(
+                f'https://api.mojang.com/users/profiles/minecraft/{name}',
+                payload={
+                    "name": name,
+                    "id": uuid,
+                },
+            )
+            m.get(
+                f'https://api.hypixel.net/status?key={key}&uuid={uuid}',
+                payload=utils.response('player_status_online'),
+            )
+
+            first = await client.player_status(name)
+            second = await client.player_status(name)
+            assert first == second
+            assert client.hypixel_cache_info.hits == 1
+            assert client.mojang_cache_info.hits == 1
+
+            client.clear_cache()
+            assert client.hypixel_cache_info.currsize == 0
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_client_cache_skips_keys(key):
+    backend = SQLiteCache(':memory:')
+    client = hypixel.Client(key, cache_h=True, cache_backend_h=backend)
+    async with client:
+        with aioresponses() as m:
+            m.get(
+                f'https://api.hypixel.net/key?key={key}',
+                payload={
+                    "success": True,
+                    "record": {
+                        "key": key,
+                        "owner": "b423f646-99f9-4694-ad23-66aa9647c606",
+                        "limit": 120,
+                        "queriesInPastMin": 3,
+                        "totalQueries": 2343300,
+                    },
+                },
+                repeat=True,
+            )
+
+            await client.key(key)
+            await client.key(key)
+            await client.validate_keys()
+            # Every call made a request and nothing was stored.
+            assert len(next(iter(m.requests.values()))) == 3
+            assert client.hypixel_cache_info.currsize == 0
+            rows = backend._connection.execute(
+                'SELECT key, value FROM cache'
+            ).fetchall()
+            assert not any(key in row[0] + row[1] for row in rows)
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_client_negative_cache(key):
+    name = 'notaplayer'
+    uuid = 'b423f64699f94694ad2366aa9647c606'
+    backend = MemoryCache()
+    client = hypixel.Client(
+        key,
+        cache=True,
+        cache_backend=backend,
+        negative_cache_time=0.05,
+    )
+    async with client:
+        with aioresponses() as m:
+            # Not repeated, so cached results don't make requests.
+            m.get(
+                f'https://api.mojang.com/users/profiles/minecraft/{name}',
+                status=404,
+            )
+            m.get(
+                f'https://api.hypixel.net/player?key={key}&uuid={uuid}',
+                payload={'success': True, 'player': None},
+            )
+
+            for _ in range(2):
+                with pytest.raises(hypixel.PlayerNotFound) as error:
+                    await client.get_uuid(name)
+                assert error.value.player == name
+                with pytest.raises(hypixel.PlayerNotFound):
+                    await client.player(uuid)
+            # One hit for each API since the backend is shared.
+            assert backend.stats().hits == 2
+
+            # Negative results expire sooner than positive ones.
+            await asyncio.sleep(0.06)
+            assert backend.stats().currsize == 0
+
+
+@pytest.mark.asyncio
+async def test_client_negative_cache_disabled(key):
+    name = 'notaplayer'
+    client = hypixel.Client(key, cache=True, negative_cache_time=None)
+    async with client:
+        with aioresponses() as m:
+            m.get(
+                f'https://api.mojang.com/users/profiles/minecraft/{name}',
+                status=404,
+                repeat=True,
+            )
+            for _ in range(2):
+                with pytest.raises(hypixel.PlayerNotFound):
+                    await client.get_uuid(name)
+            assert client.mojang_cache_info.currsize == 0
+
+
+@pytest.mark.asyncio
+async def test_client_stale_cache(key, utils):
+    uuid = 'b423f64699f94694ad2366aa9647c606'
+    url = f'https://api.hypixel.net/status?key={key}&uuid={uuid}'
+    backend = SQLiteCache(':memory:')
+    client = hypixel.Client(
+        key,
+        cache=True,
+        cache_backend_h=backend,
+        cache_time_h=0.01,
+        stale_cache_time_h=60,
+    )
+    async with client:
+        with aioresponses() as m:
+            online = utils.response('player_status_online')
+            offline = utils.response('player_status_offline')
+            m.get(url, payload=online)
+            m.get(url, payload=offline)
+
+            first = await client.player_status(uuid)
+            await asyncio.sleep(0.02)
+            # Stale responses are returned while one refresh runs.
+            stale = await asyncio.gather(
+                client.player_status(uuid),
+                client.player_status(uuid),
+            )
+            assert all(status == first for status in stale)
+            await asyncio.sleep(0)
+            await asyncio.sleep(0.01)
+            assert await client.player_status(uuid) != first
+            assert sum(len(calls) for calls in m.requests.values()) == 2
+    backend.close()
+
+
+@pytest.mark.parametrize(
+    'options',
+    [
+        {'cache_time_h': None},
+        {'cache_time_h': 0},
+        {'cache_time_h': -1},
+        {'cache_time_h': 60},
+        {'cache_time_h': 120},
+    ],
+)
+def test_client_stale_cache_time(key, options):
+    # Stale responses need a cache time to be stale after.
+    with pytest.raises(hypixel.ArgumentError):
+        hypixel.Client(key, stale_cache_time_h=60, **options)
+
+
+@pytest.mark.asyncio
+async def test_identity_store(tmp_path):
+    path = str(tmp_path / 'identities.db')
+    store = IdentityStore(path)
+    await store.set('duhby', 'b423f64699f94694ad2366aa9647c606')
+    assert await store.get_uuid('DUHBY') == 'b423f64699f94694ad2366aa9647c606'
+    assert await store.get_name('b423f64699f94694ad2366aa9647c606') == 'duhby'
+
+    # The username moved to another player.
+    await store.set('duhby', '6e7e2ac1e3c94b1b89e1d41d0b1a3fbe')
+    assert await store.get_name('b423f64699f94694ad2366aa9647c606') is None
+
+    # Another connection, e.g. from another process, sees the entries.
+    other = IdentityStore(path, max_age=None)
+    assert await other.get_uuid('duhby') == '6e7e2ac1e3c94b1b89e1d41d0b1a3fbe'
+    other.close()
+
+    store.max_age = 0
+    assert await store.get_uuid('duhby') is None
+    store.clear()
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_client_identity_store(key):
+    name = 'duhby'
+    uuid = 'b423f64699f94694ad2366aa9647c606'
+    store = IdentityStore(':memory:')
+    with aioresponses() as m:
+        # Not repeated, so only the first client makes a request.
+        m.get(
+            f'https://api.mojang.com/users/profiles/minecraft/{name}',
+            payload={
+                "name": 'Duhby',
+                "id": uuid,
+            },
+        )
+        async with hypixel.Client(key, identity_store=store) as client:
+            assert await client.get_uuid(name) == uuid
+        async with hypixel.Client(key, identity_store=store) as client:
+            assert await client.get_uuid(name) == uuid
+            assert await client.get_name(uuid) == 'Duhby'
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_client_disk_cache(tmp_path, key, utils):
+    uuid = 'b423f64699f94694ad2366aa9647c606'
+    path = str(tmp_path / 'cache')
+    with aioresponses() as m:
+        # Not repeated, so the second client has to use the disk cache.
+        m.get(
+            f'https://api.hypixel.net/status?key={key}&uuid={uuid}',
+            payload=utils.response('player_status_online'),
+        )
+        for _ in range(2):
+            client = hypixel.Client(
+                key, cache=True, cache_backend_h=DiskCache(path)
+            )
+            assert client.cache_backend_h.max_age == 60
+            async with client:
+                status = await client.player_status(uuid)
+                assert status.online
+
+        # A lower cache time applies to the restored response.
+        m.get(
+            f'https://api.hypixel.net/status?key={key}&uuid={uuid}',
+            payload=utils.response('player_status_offline'),
+        )
+        await asyncio.sleep(0.02)
+        client = hypixel.Client(
+            key, cache=True, cache_backend_h=DiskCache(path),
+            cache_time_h=0.01,
+        )
+        async with client:
+            status = await client.player_status(uuid)
+            assert not status.online
+
+    # The stale time is used if it's set, and passed values and caches
+    # that don't expire are left alone.
+    for options, max_age in (
+        ({'cache_time_h': 1, 'stale_cache_time_h': 5}, 5),
+        ({'cache_backend_h': DiskCache(path, max_age=1)}, 1),
+        ({'cache_time_h': None}, None),
+    ):
+        options.setdefault('cache_backend_h', DiskCache(path))
+        async with hypixel.Client(key, cache=True, **options) as client:
+            assert client.cache_backend_h.max_age == max_age
+
+
+@pytest.mark.asyncio
+async def test_client_cache_errors(key):
+    name = 'duhby'
+    uuid = 'b423f64699f94694ad2366aa9647c606'
+    url = f'https://api.mojang.com/users/profiles/minecraft/{name}'
+    client = hypixel.Client(key, cache=True, cache_errors_m={})
+    async with client:
+        with aioresponses() as m:
+            m.get(url, status=500)
+            m.get(url, status=404)
+            m.get(url, status=404)
+            m.get(url, payload={"name": name, "id": uuid})
+
+            # Failures aren't replayed to later calls.
+            with pytest.raises(hypixel.ApiError):
+                await client.get_uuid(name)
+            # Not found errors aren't cached either with an empty policy.
+            for _ in range(2):
+                with pytest.raises(hypixel.PlayerNotFound):
+                    await client.get_uuid(name)
+            assert await client.get_uuid(name) == uuid
+            assert await client.get_uuid(name) == uuid
+            assert client.mojang_cache_info.hits == 1
@@ -1,7 +1,14 @@
 """Tests for general hypixel.Client methods."""
 
+import asyncio
+import json
+import random
+
+import aiohttp
 from aioresponses import aioresponses
+import hypixel
 import hypixel.errors
+from hypixel.utils import _clean
 import pytest
 import uuid
 
@@ -18,6 +25,31 @@ async def test_add_and_remove_key(generate_client):
         assert new_key not in client.keys
 
 
+@pytest.mark.asyncio
+async def test_session_options(key):
+    client = hypixel.Client(
+        key,
+        timeout=5,
+        connection_limit_per_host=4,
+        keepalive_timeout=60,
+    )
+    async with client:
+        pass
+    # Reopened sessions keep the options.
+    async with client:
+        assert client._session.timeout.total == 5
+        assert client._session.connector.limit_per_host == 4
+
+
+@pytest.mark.asyncio
+async def test_external_session(key):
+    session = aiohttp.ClientSession()
+    async with hypixel.Client(key, session=session) as client:
+        assert client._session is session
+    assert not session.closed
+    await session.close()
+
+
 @pytest.mark.asyncio
 async def test_get_name(generate_client):
     name = 'duhby'
@@ -52,6 +84,92 @@ async def test_get_uuid(generate_client):
             assert uuid == await client.get_uuid(name)
 
 
+@pytest.mark.asyncio
+async def test_get_uuid_batched(key):
+    names = ['duhby', 'gamerboy80', 'not a name', 'missing']
+    async with hypixel.Client(key, batch_uuids=True) as client:
+        with aioresponses() as m:
+            # Only one request, so every name has to be in it.
+            m.post(
+                'https://api.mojang.com/profiles/minecraft',
+                payload=[
+                    {
+                        "id": "b423f64699f94694ad2366aa9647c606",
+                        "name": "duhby",
+                    },
+                    {
+                        "id": "2b3a4c1d5f8e4d0a9c7b6e5f4d3c2b1a",
+                        "name": "Gamerboy80",
+                    },
+                ],
+            )
+
+            results = await asyncio.gather(
+                *(client.get_uuid(name) for name in names),
+                return_exceptions=True,
+            )
+            assert results[0] == 'b423f64699f94694ad2366aa9647c606'
+            assert results[1] == '2b3a4c1d5f8e4d0a9c7b6e5f4d3c2b1a'
+            assert isinstance(results[2], hypixel.PlayerNotFound)
+            assert isinstance(results[3], hypixel.PlayerNotFound)
+
+
+@pytest.mark.asyncio
+async def test_mojang_retry_backoff(key, monkeypatch):
+    name = 'duhby'
+    uuid = 'b423f64699f94694ad2366aa9647c606'
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record(delay):
+        delays.append(delay)
+        await sleep(0)
+
+    # Delays are the upper bound of each retry's random range.
+    monkeypatch.setattr(random.Random, 'uniform', lambda self, a, b: b)
+    monkeypatch.setattr(asyncio, 'sleep', record)
+    async with hypixel.Client(key, rate_limit_m=True) as client:
+        with aioresponses() as m:
+            url = f'https://api.mojang.com/users/profiles/minecraft/{name}'
+            for _ in range(3):
+                m.get(url, status=429)
+            m.get(url, payload={"name": name, "id": uuid})
+            url = (
+                'https://sessionserver.mojang.com/session/minecraft/'
+                f'profile/{uuid}'
+            )
+            for _ in range(3):
+                m.get(url, status=429)
+            m.get(url, payload={"id": uuid, "name": name})
+
+            assert await client.get_uuid(name) == uuid
+            assert await client.get_name(uuid) == name
+    assert delays == [4, 8, 16] * 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('concurrency', [0, -1])
+async def test_concurrency(key, utils, concurrency):
+    with pytest.raises(hypixel.ArgumentError):
+        hypixel.Client(key, concurrency=concurrency)
+
+    data = utils.response('guild')['guild']
+    guild = hypixel.Guild(**_clean(data, mode='GUILD'))
+    ids = ['b423f64699f94694ad2366aa9647c606']
+    async with hypixel.Client(key) as client:
+        # Raised before any request, instead of waiting forever.
+        for method, args in (
+            (client.players, (ids,)),
+            (client.player_statuses, (ids,)),
+            (client.guilds_from_players, (ids,)),
+            (client.guild_member_names, (guild,)),
+        ):
+            with pytest.raises(hypixel.ArgumentError):
+                await asyncio.wait_for(
+                    method(*args, concurrency=concurrency), 1
+                )
+
+
 @pytest.mark.asyncio
 async def test_validate_keys(generate_client, key):
     async for client in generate_client:
@@ -87,3 +205,23 @@ async def test_validate_keys(generate_client, key):
             )
             with pytest.raises(hypixel.InvalidApiKey):
                 await client.validate_keys()
+
+
+@pytest.mark.asyncio
+async def test_json_decoder(key, utils):
+    bodies = []
+
+    def decoder(body):
+        bodies.append(body)
+        return json.loads(body)
+
+    async with hypixel.Client(key, json_decoder=decoder) as client:
+        with aioresponses() as m:
+            m.get(
+                f'https://api.hypixel.net/playerCount?key={key}',
+                payload=utils.response('player_count'),
+            )
+            assert await client.player_count() == 100000
+    # Decoded straight from the body's bytes.
+    assert len(bodies) == 1
+    assert isinstance(bodies[0], bytes)
@@ -57,6 +57,15 @@ def test_game():
     assert game.standard_name == 'Bed Wars'
 
 
+def test_game_and_color_singletons():
+    game = Game.from_type('BEDWARS')
+    assert game is Game.from_id(58)
+    assert {game: 1}[Game.from_type('BEDWARS')] == 1
+    assert Color.from_type('DARK_RED') is Color.from_type('DARK_RED')
+    with pytest.raises(AttributeError):
+        game.id = 1
+
+
 @pytest.mark.parametrize(
     ('type_name', 'expected'),
     [
@@ -89,3 +98,14 @@ def test_achievement_legacy():
     assert achievement.global_unlocked == None
     assert achievement.game_unlocked == None
     assert achievement.legacy == True
+
+
+def test_achievement_shared():
+    achievement = Achievement.from_type('murdermystery_be_the_hero')
+    assert achievement is Achievement.from_type('murdermystery_be_the_hero')
+    # Names are case insensitive.
+    assert Achievement.from_type('murdermystery_BE_THE_HERO') == Achievement(
+        **{**vars(achievement), 'type_name': 'murdermystery_BE_THE_HERO'}
+    )
+    with pytest.raises(AttributeError):
+        achievement.points = 10
@@ -0,0 +1,146 @@
+"""Tests for hypixel.export"""
+
+import csv
+from functools import reduce
+
+from aioresponses import aioresponses
+import hypixel
+from hypixel.export import export_players, player_columns
+import pytest
+
+np = pytest.importorskip('numpy')
+
+COLUMNS = [
+    'network_exp',
+    'level',
+    'karma',
+    'bedwars.level',
+    'bedwars.fkdr',
+    'bedwars.solo.wins',
+    'bedwars.solo.kdr',
+    'duels.wins',
+    'duels.classic.wlr',
+    'skywars.level',
+    'uhc.level',
+    'wool_games.level',
+    'wool_games.wool_wars.kills',
+    'arcade.ctw.captures',
+]
+# Column -> raw key, for columns that players hold as other types.
+RAW_COLUMNS = {
+    'first_login': 'firstLogin',
+    'last_login': 'lastLogin',
+    'last_logout': 'lastLogout',
+    'name': 'displayname',
+}
+
+
+async def get_player(key, utils, keep_raw):
+    uuid = 'b423f64699f94694ad2366aa9647c606'
+    async with hypixel.Client(key, keep_raw=keep_raw) as client:
+        with aioresponses() as m:
+            m.get(
+                f'https://api.hypixel.net/player?key={key}&uuid={uuid}',
+                payload=utils.response('player'),
+            )
+            return await client.player(uuid)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('keep_raw', [True, False, 'compact'])
+async def test_player_columns(key, utils, keep_raw):
+    player = await get_player(key, utils, keep_raw)
+    response = utils.response('player')
+    expected = {
+        column: reduce(getattr, column.split('.'), player)
+        for column in COLUMNS
+    }
+    expected.update({
+        column: response['player'][raw]
+        for column, raw in RAW_COLUMNS.items()
+    })
+    columns = dict.fromkeys(COLUMNS, 'f8')
+    columns.update(dict.fromkeys(RAW_COLUMNS, 'i8'), name='U16')
+
+    for players in (
+        [player] * 3,
+        [response] * 3,
+        [response['player']] * 3,
+    ):
+        chunks = list(player_columns(players, columns, chunk_size=2))
+        assert [len(chunk['level']) for chunk in chunks] == [2, 1]
+        for chunk in chunks:
+            for column, value in expected.items():
+                assert chunk[column].dtype == np.dtype(columns[column])
+                assert (chunk[column] == value).all(), column
+
+
+def test_player_columns_missing(utils):
+    response = utils.response('player')
+    players = [{'player': None}, {}, response, {'player': None}]
+    columns = {'uuid': 'U32', 'bedwars.wins': 'i8', 'bedwars.fkdr': 'f4'}
+
+    chunks = list(player_columns(players, columns, chunk_size=2))
+    assert len(chunks) == 2
+    assert chunks[0]['uuid'].tolist() == ['']
+    assert chunks[0]['bedwars.wins'].dtype == np.int64
+    assert chunks[0]['bedwars.fkdr'].dtype == np.float32
+    assert chunks[1]['uuid'].tolist() == [response['player']['uuid']]
+
+
+@pytest.mark.parametrize(
+    'columns',
+    [
+        ['bedwars.nothing'],
+        ['nothing.wins'],
+        ['bedwars.nothing.wins'],
+        ['bedwars._data'],
+        ['kdr'],
+        {'uuid': object},
+        [],
+    ],
+)
+def test_player_columns_invalid(columns):
+    with pytest.raises(hypixel.ArgumentError):
+        next(player_columns([], columns))
+
+
+def test_export_players(tmp_path, utils):
+    response = utils.response('player')
+    columns = {'uuid': 'U32', 'bedwars.solo.wins': 'i8', 'level': 'f8'}
+    expected = next(player_columns([response], columns))
+
+    path = tmp_path / 'players.npz'
+    assert export_players([response] * 5, path, columns, chunk_size=2) == 5
+    with np.load(path) as file:
+        assert sorted(file.files) == sorted(columns)
+        for column in columns:
+            assert (file[column] == expected[column][0]).all()
+            assert file[column].shape == (5,)
+
+    path = tmp_path / 'players.csv'
+    assert export_players([response] * 3, path, columns, chunk_size=2) == 3
+    with open(path, newline='') as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == list(columns)
+    assert rows[1:] == [[
+        response['player']['uuid'],
+        str(expected['bedwars.solo.wins'][0]),
+        str(expected['level'][0]),
+    ]] * 3
+
+    path = tmp_path / 'empty.npz'
+    assert export_players([], path, columns) == 0
+    with np.load(path) as file:
+        assert file['level'].shape == (0,)
+
+    with pytest.raises(hypixel.ArgumentError):
+        export_players([], tmp_path / 'players.json', columns)
+
+    for chunk_size in (0, -1):
+        path = tmp_path / 'chunks.npz'
+        with pytest.raises(hypixel.ArgumentError):
+            export_players([response], path, columns, chunk_size=chunk_size)
+        assert not path.exists()
+        with pytest.raises(hypixel.ArgumentError):
+            next(player_columns([response], columns, chunk_size=chunk_size))
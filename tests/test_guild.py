@@ -1,9 +1,13 @@
+import asyncio
+
 from aioresponses import aioresponses
 from datetime import datetime, timezone
 import pytest
 
+import hypixel
 from hypixel import Color
 from hypixel import Game
+from hypixel.utils import _clean
 
 
 def _test_guild(guild, id_):
@@ -164,3 +168,141 @@ async def test_guild(generate_client, key, utils):
             _test_guild(guild, id_)
             guild = await client.guild_from_name(name)
             _test_guild(guild, id_)
+
+
+def test_guild_lazy(utils):
+    data = utils.response('guild')['guild']
+    # Duplicate rank names use the first rank.
+    data['ranks'] = data['ranks'] + [dict(data['ranks'][1], priority=0)]
+    guild = hypixel.Guild(**_clean(data, mode='GUILD'))
+
+    member = guild.members[1]
+    assert member.rank is guild.ranks[1]
+    assert member._exp_history == data['members'][1]['expHistory']
+    history = member.exp_history
+    assert history[datetime(2022, 10, 15, tzinfo=timezone.utc)] == 0
+    assert member._exp_history is None
+    assert member.exp_history is history
+
+
+@pytest.mark.asyncio
+async def test_guild_member_names(key, utils):
+    uuids = [
+        '24c182c6716b47c68f60a1be9045c449',
+        '369d8ab8cded461091d1189acd3b44d2',
+        'cc7fbd331def4e67a02254df4ef05a4f',
+    ]
+    url = 'https://sessionserver.mojang.com/session/minecraft/profile/{}'
+    data = utils.response('guild')['guild']
+
+    async with hypixel.Client(key, cache_m=True) as client:
+        with aioresponses() as m:
+            m.get(url.format(uuids[0]), payload={'id': uuids[0], 'name': 'a'})
+            m.get(url.format(uuids[1]), payload={'id': uuids[1], 'name': 'b'})
+            m.get(url.format(uuids[2]), status=404)
+
+            guild = hypixel.Guild(**_clean(data, mode='GUILD'))
+            names = await client.guild_member_names(guild, concurrency=2)
+            assert list(names) == uuids
+            assert names[uuids[0]] == 'a'
+            assert names[uuids[1]] == 'b'
+            assert isinstance(names[uuids[2]], hypixel.PlayerNotFound)
+            assert [member.name for member in guild.members] == [
+                'a', 'b', None,
+            ]
+
+            # Names are cached, so no more requests are needed.
+            guild = hypixel.Guild(**_clean(data, mode='GUILD'))
+            members = [
+                member async for member, _ in
+                client.iter_guild_member_names(guild)
+            ]
+            assert sorted(member.uuid for member in members) == uuids
+            assert guild.members[0].name == 'a'
+
+
+@pytest.mark.asyncio
+async def test_guild_players(key, utils):
+    uuids = [
+        '24c182c6716b47c68f60a1be9045c449',
+        '369d8ab8cded461091d1189acd3b44d2',
+        'cc7fbd331def4e67a02254df4ef05a4f',
+    ]
+    url = 'https://api.hypixel.net/player?key={}&uuid={}'
+    data = utils.response('guild')['guild']
+    guild = hypixel.Guild(**_clean(data, mode='GUILD'))
+
+    async with hypixel.Client(key) as client:
+        with aioresponses() as m:
+            for uuid in uuids[:2]:
+                m.get(
+                    url.format(key, uuid),
+                    payload=utils.response('player'),
+                    repeat=True,
+                )
+            m.get(
+                url.format(key, uuids[2]),
+                payload={'success': True, 'player': None},
+                repeat=True,
+            )
+
+            results = [
+                result async for result in client.guild_players(guild)
+            ]
+            assert sorted(member.uuid for member, _ in results) == uuids
+            results = dict(
+                (member.uuid, player) for member, player in results
+            )
+            assert results[uuids[0]].name == 'duhby'
+            assert isinstance(results[uuids[2]], hypixel.PlayerNotFound)
+
+            # Guild Master, then OFFICER (priority 4), then Member
+            # (priority 3). A window of 1 requests them one at a time
+            # in that order.
+            m.requests.clear()
+            members = [
+                member async for member, _ in
+                client.guild_players(guild, window=1, order='rank')
+            ]
+            expected = [uuids[0], uuids[2], uuids[1]]
+            assert [member.uuid for member in members] == expected
+            assert [str(url.query['uuid']) for _, url in m.requests] == expected
+
+            # Closing early cancels the request started ahead.
+            m.requests.clear()
+            players = client.guild_players(guild, window=1)
+            await players.__anext__()
+            await players.aclose()
+            await asyncio.sleep(0)
+            assert len(m.requests) == 1
+
+            with pytest.raises(hypixel.ArgumentError):
+                async for _ in client.guild_players(guild, order='name'):
+                    pass
+            with pytest.raises(hypixel.ArgumentError):
+                async for _ in client.guild_players(guild, window=0):
+                    pass
+
+
+@pytest.mark.asyncio
+async def test_guild_players_legacy_rank(key, utils):
+    # Legacy guilds use upper case rank names without priorities.
+    data = utils.response('guild')['guild']
+    data['ranks'] = []
+    data['members'] = data['members'][::-1]
+    ranks = ['OFFICER', 'MEMBER', 'GUILDMASTER']
+    for member, rank in zip(data['members'], ranks):
+        member['rank'] = rank
+    guild = hypixel.Guild(**_clean(data, mode='GUILD'))
+    master = data['members'][2]['uuid']
+
+    async with hypixel.Client(key) as client:
+        with aioresponses() as m:
+            m.get(
+                f'https://api.hypixel.net/player?key={key}&uuid={master}',
+                payload=utils.response('player'),
+            )
+            players = client.guild_players(guild, window=1, order='rank')
+            member, _ = await players.__anext__()
+            await players.aclose()
+    assert member.uuid == master
@@ -0,0 +1,89 @@
+"""Tests for hypixel.levels"""
+
+from hypixel import levels
+import pytest
+
+np = pytest.importorskip('numpy')
+
+EXP = [
+    0, 1, 19, 20, 499, 500, 1499, 1500, 6999, 7000, 14999, 15000, 25210,
+    99999, 100000, 486999, 487000, 487500, 1234567, 15000000, 123456789,
+    2980999999, 2981000000, 3000000000,
+]
+
+
+@pytest.mark.parametrize(
+    ('exp', 'expected'),
+    [
+        (0, 0.0),
+        (99999, 1.0),
+        (100000, 1.0),
+        (175000, 1.5),
+        (15000000, 12.0),
+        (21500000, 14.5),
+        (23000000, 15.0),
+        (2980999999, 1001.0),
+        (2981000000, 1000),
+    ],
+)
+def test_guild_level(exp, expected):
+    assert levels.guild_level(exp) == expected
+
+
+@pytest.mark.parametrize(
+    ('exp', 'expected'),
+    [
+        (0, 0.0),
+        (500, 1.0),
+        (7000, 4.0),
+        (12000, 5.0),
+        (487000, 100.0),
+        (487250, 100.5),
+    ],
+)
+def test_wool_wars_level(exp, expected):
+    assert levels.wool_wars_level(exp) == expected
+
+
+@pytest.mark.parametrize(
+    ('exp', 'expected'),
+    [
+        (0, 1.0),
+        (10, 1.5),
+        (15000, 12.0),
+        (25000, 13.0),
+    ],
+)
+def test_skywars_level(exp, expected):
+    assert levels.skywars_level(exp) == expected
+
+
+@pytest.mark.parametrize(
+    ('score', 'expected'),
+    [
+        (0, 1),
+        (9, 1),
+        (10, 2),
+        (25210, 15),
+        (100000, 15),
+    ],
+)
+def test_uhc_level(score, expected):
+    assert levels.uhc_level(score) == expected
+
+
+@pytest.mark.parametrize(
+    ('scalar', 'batch', 'atol'),
+    [
+        (levels.guild_level, levels.guild_levels, 0),
+        (levels.network_level, levels.network_levels, 0.01),
+        (levels.skywars_level, levels.skywars_levels, 0),
+        (levels.uhc_level, levels.uhc_levels, 0),
+        (levels.wool_wars_level, levels.wool_wars_levels, 0.01),
+    ],
+)
+def test_batch_levels(scalar, batch, atol):
+    expected = [scalar(exp) for exp in EXP]
+    np.testing.assert_allclose(batch(np.array(EXP)), expected, atol=atol)
+    # Lists work too.
+    np.testing.assert_allclose(batch(EXP), expected, atol=atol)
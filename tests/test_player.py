@@ -1,8 +1,13 @@
 import asyncio
 import datetime
+import json
+import zlib
 
 from aioresponses import aioresponses
 import hypixel
+from hypixel.models.player import player as player_module
+from hypixel.models.player.player import MODES
+from hypixel.utils import _clean
 import pytest
 
 
@@ -410,3 +415,109 @@ async def test_player(generate_client, key, utils):
 
             # Murder Mystery
             mm = player.murder_mystery
+
+
+@pytest.mark.asyncio
+async def test_players(generate_client, key, utils):
+    name = 'duhby'
+    uuid = 'b423f64699f94694ad2366aa9647c606'
+    missing = 'notaplayer'
+    async for client in generate_client:
+        with aioresponses() as m:
+            m.get(
+                f'https://api.mojang.com/users/profiles/minecraft/{name}',
+                payload={
+                    "name": name,
+                    "id": uuid,
+                },
+            )
+            m.get(
+                f'https://api.mojang.com/users/profiles/minecraft/{missing}',
+                status=404,
+            )
+            # Not repeated, so a duplicate request would fail.
+            m.get(
+                f'https://api.hypixel.net/player?key={key}&uuid={uuid}',
+                payload=utils.response('player'),
+            )
+
+            players = await client.players(
+                [name, missing, name],
+                concurrency=2,
+            )
+            assert list(players) == [name, missing]
+            assert players[name].uuid == uuid
+            assert isinstance(players[missing], hypixel.PlayerNotFound)
+
+
+def test_player_lazy_modes(monkeypatch, utils):
+    built = []
+    clean = player_module.utils._clean
+
+    def _clean_spy(data, mode):
+        built.append(mode)
+        return clean(data, mode)
+
+    monkeypatch.setattr(player_module.utils, '_clean', _clean_spy)
+    response = utils.response('player')
+    data = {'raw': response, '_data': response['player']}
+    data.update(_clean(response['player'], mode='PLAYER'))
+    player = hypixel.Player(**data)
+    assert built == []
+    bedwars = player.bedwars
+    # Built once and kept.
+    assert player.bedwars is bedwars
+    # Bedwars builds its own modes, but no other game model is built.
+    assert built.count('BEDWARS') == 1
+    assert 'DUELS' not in built
+    with pytest.raises(AttributeError):
+        player.not_a_mode
+
+
+def test_player_response_unchanged(utils):
+    response = utils.response('player')
+    data = {'raw': response, '_data': response['player']}
+    data.update(_clean(response['player'], mode='PLAYER'))
+    player = hypixel.Player(**data)
+    for mode in MODES:
+        getattr(player, mode)
+    # Models share the response's data instead of copying it, so it
+    # can be cached and built from again.
+    assert response == utils.response('player')
+    assert player.bedwars._data is response['player']['stats']['Bedwars']
+
+
+@pytest.mark.asyncio
+async def test_player_keep_raw(key, utils):
+    uuid = 'b423f64699f94694ad2366aa9647c606'
+    async with hypixel.Client(key, keep_raw=False) as client:
+        with aioresponses() as m:
+            m.get(
+                f'https://api.hypixel.net/player?key={key}&uuid={uuid}',
+                payload=utils.response('player'),
+                repeat=True,
+            )
+
+            player = await client.player(uuid)
+            assert player.raw is None
+            assert player.bedwars._data is None
+            assert player.duels.classic._data is None
+            assert player.name == 'duhby'
+
+            # Overridden per call.
+            player = await client.player(uuid, keep_raw='compact')
+            raw = json.loads(zlib.decompress(player.raw))
+            assert raw == utils.response('player')
+            player = await client.player(uuid, keep_raw=True)
+            assert player.raw == utils.response('player')
+
+            # Typos raise instead of dropping the data.
+            with pytest.raises(hypixel.ArgumentError):
+                await client.player(uuid, keep_raw='compat')
+            with pytest.raises(hypixel.ArgumentError):
+                await client.players([uuid], keep_raw='compat')
+
+    with pytest.raises(hypixel.ArgumentError):
+        hypixel.Client(key, keep_raw='compat')
+    with pytest.raises(hypixel.ArgumentError):
+        hypixel.Client(key, keep_raw=None)
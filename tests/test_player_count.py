@@ -1,3 +1,5 @@
+import asyncio
+
 from aioresponses import aioresponses
 import hypixel
 import pytest
@@ -14,3 +16,39 @@ async def test_player_count(generate_client, key, utils):
 
             player_count = await client.player_count()
             assert player_count == 100000
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_remaining(generate_client, key, utils):
+    async for client in generate_client:
+        assert client.rate_limit_remaining is None
+        with aioresponses() as m:
+            m.get(
+                f'https://api.hypixel.net/playerCount?key={key}',
+                payload=utils.response('player_count'),
+                headers={
+                    'RateLimit-Limit': '120',
+                    'RateLimit-Remaining': '119',
+                    'RateLimit-Reset': '59',
+                },
+            )
+
+            await client.player_count()
+            assert client.rate_limit_remaining == 119
+
+
+@pytest.mark.asyncio
+async def test_player_count_coalesced(generate_client, key, utils):
+    async for client in generate_client:
+        with aioresponses() as m:
+            # Not repeated, so a second request would fail.
+            m.get(
+                f'https://api.hypixel.net/playerCount?key={key}',
+                payload=utils.response('player_count'),
+            )
+
+            counts = await asyncio.gather(
+                client.player_count(),
+                client.player_count(),
+            )
+            assert counts == [100000, 100000]
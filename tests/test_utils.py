@@ -1,6 +1,13 @@
 """Tests for hypixel.utils"""
 
+import asyncio
+from dataclasses import dataclass, field
+
+import hypixel
 from hypixel import utils
+from hypixel.utils import RateLimiter
+from hypixel.utils import single_flight
+from hypixel.utils import slotted
 import pytest
 
 
@@ -37,4 +44,110 @@ def test_romanize(number, expected):
     assert utils.romanize(number) == expected
 
 
+@pytest.mark.asyncio
+async def test_rate_limiter():
+    limiter = RateLimiter()
+    # Unknown quota doesn't block.
+    await limiter.acquire()
+    assert limiter.remaining is None
+
+    limiter.update({
+        'RateLimit-Limit': '120',
+        'RateLimit-Remaining': '1',
+        'RateLimit-Reset': '60',
+    })
+    assert limiter.limit == 120
+    assert limiter.remaining == 1
+    await limiter.acquire(timeout=1)
+    assert limiter.remaining == 0
+
+    # Out of order responses from the same window don't add quota.
+    limiter.update({
+        'RateLimit-Limit': '120',
+        'RateLimit-Remaining': '5',
+        'RateLimit-Reset': '60',
+    })
+    assert limiter.remaining == 0
+
+    # The window resets later than the timeout.
+    with pytest.raises(hypixel.TimeoutError):
+        await limiter.acquire(timeout=1)
+
+    # Missing headers are ignored.
+    limiter.update({})
+    assert limiter.remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight():
+    calls = 0
+    event = asyncio.Event()
+
+    async def fetch(value):
+        nonlocal calls
+        calls += 1
+        await event.wait()
+        return value
+
+    shared = single_flight(fetch)
+    first = asyncio.ensure_future(shared(1))
+    second = asyncio.ensure_future(shared(1))
+    await asyncio.sleep(0)
+
+    # Cancelling one caller doesn't cancel the call for the other.
+    first.cancel()
+    event.set()
+    assert await second == 1
+    assert first.cancelled()
+    assert calls == 1
+
+    # The call is made again once the previous one finished.
+    assert await shared(1) == 1
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled_last_waiter():
+    calls = 0
+    event = asyncio.Event()
+
+    async def fetch(value):
+        nonlocal calls
+        calls += 1
+        await event.wait()
+        return value
+
+    shared = single_flight(fetch)
+    first = asyncio.ensure_future(shared(1))
+    await asyncio.sleep(0)
+
+    # The only caller is cancelled, then another arrives before the
+    # cancelled call has finished.
+    first.cancel()
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(shared(1))
+    await asyncio.sleep(0)
+    event.set()
+    assert await second == 1
+    assert first.cancelled()
+    assert calls == 2
+
+
+def test_slotted():
+    @slotted
+    @dataclass
+    class Model:
+        a: int
+        b: list = field(default_factory=list)
+        c: int = field(init=False, default=3)
+
+    model = Model(1)
+    assert not hasattr(model, '__dict__')
+    assert model == Model(1)
+    assert model != Model(2)
+    assert (model.b, model.c) == ([], 3)
+    with pytest.raises(AttributeError):
+        model.d = 4
+
+
 # Other functions are covered by other tests.